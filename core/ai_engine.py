@@ -687,10 +687,10 @@ class AIEngine:
         if relevant_context and relevant_context.get('conversation_history'):
             recent_messages = relevant_context['conversation_history'][-6:]  # Last 6 messages
             for msg in recent_messages:
-                if msg['sender'] == 'user':
-                    input_parts.append(f"User: {msg['content']}")
+                if msg.sender == 'user':
+                    input_parts.append(f"User: {msg.content}")
                 else:
-                    input_parts.append(f"Assistant: {msg['content']}")
+                    input_parts.append(f"Assistant: {msg.content}")
         
         # Add document context if available
         if relevant_context and relevant_context.get('document_context'):
@@ -815,8 +815,8 @@ class AIEngine:
             if recent_messages:
                 last_topic = None
                 for msg in reversed(recent_messages):
-                    if msg['sender'] == 'user' and len(msg['content']) > 10:
-                        last_topic = msg['content'][:50]
+                    if msg.sender == 'user' and len(msg.content) > 10:
+                        last_topic = msg.content[:50]
                         break
                 
                 if last_topic:
@@ -5,16 +5,59 @@ This module provides context preservation and intelligent memory management
 across chat, documents, and games features.
 """
 
+import copy
 import json
 import logging
+import mmap
+import threading
+import time
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from models.data_models import Document, ChatMessage, GameState
 
+# Context files larger than this are memory-mapped and parsed in place
+MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Keyword indicators used to classify queries
+DOCUMENT_QUERY_INDICATORS = (
+    'document', 'doc', 'file', 'text', 'content', 'paper', 'article',
+    'what does', 'according to', 'in the', 'from the', 'based on'
+)
+GAME_QUERY_INDICATORS = (
+    'game', 'play', 'move', 'turn', 'board', 'win', 'lose',
+    'tic-tac-toe', 'connect', 'battleship', 'strategy'
+)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+@lru_cache(maxsize=512)
+def _is_document_query_cached(query_lower: str) -> bool:
+    """Determine if a lowercased query is document-related"""
+    return any(indicator in query_lower for indicator in DOCUMENT_QUERY_INDICATORS)
+
+
+@lru_cache(maxsize=512)
+def _is_game_query_cached(query_lower: str) -> bool:
+    """Determine if a lowercased query is game-related"""
+    return any(indicator in query_lower for indicator in GAME_QUERY_INDICATORS)
+
 
 class ContextType(Enum):
     """Types of context that can be managed"""
@@ -31,6 +74,11 @@ class ContextPriority(Enum):
     CRITICAL = 4
 
 
+# Reverse lookups for restoring enums from their serialized values
+_STR_CTX: Dict[str, ContextType] = {member.value: member for member in ContextType}
+_INT_PRI: Dict[int, ContextPriority] = {member.value: member for member in ContextPriority}
+
+
 @dataclass
 class ContextItem:
     """Individual context item with metadata"""
@@ -92,6 +140,19 @@ class ContextManager:
         self.context_expiry_hours = 24  # Hours before context expires
         self.cleanup_threshold = 0.8  # Cleanup when 80% of memory is used
         
+        # Deferred persistence: mutators only bump a generation, and a background
+        # writer snapshots the state under _state_lock once a burst settles.
+        # Snapshots carry a generation so an older one never overwrites a newer file.
+        self.save_delay_seconds = 0.25
+        self._state_lock = threading.RLock()  # held by mutators and while snapshotting
+        self._save_cond = threading.Condition(self._state_lock)
+        self._write_lock = threading.Lock()  # serializes disk writes
+        self._save_generation = 0
+        self._written_generation = 0
+        self._save_pending = False  # the writer has a request to pick up
+        self._save_closed = False
+        self._save_thread: Optional[threading.Thread] = None
+        
         # Load existing context
         self.load_context()
     
@@ -106,7 +167,7 @@ class ContextManager:
         Returns:
             bool: True if switch was successful
         """
-        try:
+        with self._state_lock:
             old_mode = self.conversation_state.current_mode
             
             # Save current context before switching
@@ -124,12 +185,10 @@ class ContextManager:
             elif new_mode == ContextType.GENERAL:
                 self._switch_to_general_context()
             
-            self.logger.info(f"Context switched from {old_mode.value} to {new_mode.value}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error switching context: {e}")
-            return False
+            self.request_save()
+        
+        self.logger.info(f"Context switched from {old_mode.value} to {new_mode.value}")
+        return True
     
     def add_conversation_message(self, message: ChatMessage) -> bool:
         """
@@ -141,7 +200,7 @@ class ContextManager:
         Returns:
             bool: True if message was added successfully
         """
-        try:
+        with self._state_lock:
             # Add to conversation history
             self.conversation_state.conversation_history.append(message)
             
@@ -149,13 +208,13 @@ class ContextManager:
             self._update_context_from_message(message)
             
             # Manage memory if needed
-            self._manage_conversation_memory()
+            try:
+                self._manage_conversation_memory()
+            except Exception as e:
+                self.logger.error(f"Error managing conversation memory: {e}")
             
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error adding conversation message: {e}")
-            return False
+            self.request_save()
+        return True
     
     def set_document_context(self, document: Document, chunks: List[str]) -> bool:
         """
@@ -168,33 +227,30 @@ class ContextManager:
         Returns:
             bool: True if context was set successfully
         """
-        try:
-            document_context = {
-                'document_id': document.id,
-                'filename': document.filename,
-                'chunks': chunks,
-                'upload_date': document.upload_date.isoformat(),
-                'file_size': document.file_size
-            }
-            
-            # Create context item
-            context_item = ContextItem(
-                id=f"document_{document.id}",
-                context_type=ContextType.DOCUMENT,
-                priority=ContextPriority.HIGH,
-                data=document_context
-            )
-            
+        document_context = {
+            'document_id': document.id,
+            'filename': document.filename,
+            'chunks': chunks,
+            'upload_date': document.upload_date.isoformat(),
+            'file_size': document.file_size
+        }
+        
+        # Create context item
+        context_item = ContextItem(
+            id=f"document_{document.id}",
+            context_type=ContextType.DOCUMENT,
+            priority=ContextPriority.HIGH,
+            data=document_context
+        )
+        
+        with self._state_lock:
             self.context_items[context_item.id] = context_item
             self.conversation_state.active_document = document.id
             self.conversation_state.document_context = document_context
-            
-            self.logger.info(f"Document context set for: {document.filename}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error setting document context: {e}")
-            return False
+            self.request_save()
+        
+        self.logger.info(f"Document context set for: {document.filename}")
+        return True
     
     def set_game_context(self, game_state: GameState) -> bool:
         """
@@ -206,34 +262,31 @@ class ContextManager:
         Returns:
             bool: True if context was set successfully
         """
-        try:
-            game_context = {
-                'game_type': game_state.game_type,
-                'board_state': game_state.board_state,
-                'current_player': game_state.current_player,
-                'game_status': game_state.game_status,
-                'move_history': game_state.move_history,
-                'ai_difficulty': game_state.ai_difficulty
-            }
-            
-            # Create context item
-            context_item = ContextItem(
-                id=f"game_{game_state.game_type}",
-                context_type=ContextType.GAME,
-                priority=ContextPriority.MEDIUM,
-                data=game_context
-            )
-            
+        game_context = {
+            'game_type': game_state.game_type,
+            'board_state': game_state.board_state,
+            'current_player': game_state.current_player,
+            'game_status': game_state.game_status,
+            'move_history': game_state.move_history,
+            'ai_difficulty': game_state.ai_difficulty
+        }
+        
+        # Create context item
+        context_item = ContextItem(
+            id=f"game_{game_state.game_type}",
+            context_type=ContextType.GAME,
+            priority=ContextPriority.MEDIUM,
+            data=game_context
+        )
+        
+        with self._state_lock:
             self.context_items[context_item.id] = context_item
             self.conversation_state.active_game = game_state.game_type
             self.conversation_state.game_context = game_context
-            
-            self.logger.info(f"Game context set for: {game_state.game_type}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error setting game context: {e}")
-            return False
+            self.request_save()
+        
+        self.logger.info(f"Game context set for: {game_state.game_type}")
+        return True
     
     def get_relevant_context(self, query: str, context_type: Optional[ContextType] = None) -> Dict[str, Any]:
         """
@@ -244,39 +297,37 @@ class ContextManager:
             context_type: Specific context type to retrieve (optional)
             
         Returns:
-            Dict containing relevant context information
+            Dict containing relevant context information, with
+            'conversation_history' holding the recent ChatMessage objects
         """
-        try:
-            relevant_context = {
-                'conversation_history': self._get_recent_conversation(),
-                'current_mode': self.conversation_state.current_mode.value,
-                'document_context': None,
-                'game_context': None
-            }
-            
-            # Add document context if available and relevant
-            if (self.conversation_state.document_context and 
-                (context_type == ContextType.DOCUMENT or self._is_document_query(query))):
-                relevant_context['document_context'] = self.conversation_state.document_context
-                # Update access tracking
-                doc_id = f"document_{self.conversation_state.active_document}"
-                if doc_id in self.context_items:
-                    self.context_items[doc_id].update_access()
-            
-            # Add game context if available and relevant
-            if (self.conversation_state.game_context and 
-                (context_type == ContextType.GAME or self._is_game_query(query))):
-                relevant_context['game_context'] = self.conversation_state.game_context
-                # Update access tracking
-                game_id = f"game_{self.conversation_state.active_game}"
-                if game_id in self.context_items:
-                    self.context_items[game_id].update_access()
-            
-            return relevant_context
-            
-        except Exception as e:
-            self.logger.error(f"Error getting relevant context: {e}")
-            return {'conversation_history': [], 'current_mode': 'general'}
+        relevant_context = {
+            'conversation_history': self._get_recent_conversation(),
+            'current_mode': self.conversation_state.current_mode.value,
+            'document_context': None,
+            'game_context': None
+        }
+        
+        # Access counts are saved along with the next change; reading context never schedules a write
+        
+        # Add document context if available and relevant
+        if (self.conversation_state.document_context and 
+            (context_type == ContextType.DOCUMENT or self._is_document_query(query))):
+            relevant_context['document_context'] = self.conversation_state.document_context
+            # Update access tracking
+            doc_id = f"document_{self.conversation_state.active_document}"
+            if doc_id in self.context_items:
+                self.context_items[doc_id].update_access()
+        
+        # Add game context if available and relevant
+        if (self.conversation_state.game_context and 
+            (context_type == ContextType.GAME or self._is_game_query(query))):
+            relevant_context['game_context'] = self.conversation_state.game_context
+            # Update access tracking
+            game_id = f"game_{self.conversation_state.active_game}"
+            if game_id in self.context_items:
+                self.context_items[game_id].update_access()
+        
+        return relevant_context
     
     def clear_context(self, context_type: Optional[ContextType] = None) -> bool:
         """
@@ -288,37 +339,41 @@ class ContextManager:
         Returns:
             bool: True if context was cleared successfully
         """
-        try:
-            if context_type is None:
-                # Clear all context
-                self.context_items.clear()
-                self.conversation_state = ConversationState()
-                self.logger.info("All context cleared")
-            else:
-                # Clear specific context type
-                items_to_remove = [
-                    item_id for item_id, item in self.context_items.items()
-                    if item.context_type == context_type
-                ]
+        with self._state_lock:
+            try:
+                if context_type is None:
+                    # Clear all context
+                    self.context_items.clear()
+                    self.conversation_state = ConversationState()
+                    _is_document_query_cached.cache_clear()
+                    _is_game_query_cached.cache_clear()
+                    self.logger.info("All context cleared")
+                else:
+                    # Clear specific context type
+                    items_to_remove = [
+                        item_id for item_id, item in self.context_items.items()
+                        if item.context_type == context_type
+                    ]
+                    
+                    for item_id in items_to_remove:
+                        del self.context_items[item_id]
+                    
+                    # Update conversation state
+                    if context_type == ContextType.DOCUMENT:
+                        self.conversation_state.active_document = None
+                        self.conversation_state.document_context = None
+                    elif context_type == ContextType.GAME:
+                        self.conversation_state.active_game = None
+                        self.conversation_state.game_context = None
+                    
+                    self.logger.info(f"Context cleared for type: {context_type.value}")
                 
-                for item_id in items_to_remove:
-                    del self.context_items[item_id]
-                
-                # Update conversation state
-                if context_type == ContextType.DOCUMENT:
-                    self.conversation_state.active_document = None
-                    self.conversation_state.document_context = None
-                elif context_type == ContextType.GAME:
-                    self.conversation_state.active_game = None
-                    self.conversation_state.game_context = None
+                self.request_save()
+                return True
                 
-                self.logger.info(f"Context cleared for type: {context_type.value}")
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error clearing context: {e}")
-            return False
+            except Exception as e:
+                self.logger.error(f"Error clearing context: {e}")
+                return False
     
     def get_context_summary(self) -> Dict[str, Any]:
         """
@@ -363,46 +418,137 @@ class ContextManager:
         Returns:
             bool: True if save was successful
         """
-        try:
-            # Prepare data for serialization
-            context_data = {
-                'conversation_state': {
-                    'current_mode': self.conversation_state.current_mode.value,
-                    'active_document': self.conversation_state.active_document,
-                    'active_game': self.conversation_state.active_game,
-                    'conversation_history': [
-                        {
-                            'id': msg.id,
-                            'sender': msg.sender,
-                            'content': msg.content,
-                            'timestamp': msg.timestamp.isoformat(),
-                            'context_type': msg.context_type
-                        }
-                        for msg in self.conversation_state.conversation_history
-                    ],
-                    'document_context': self.conversation_state.document_context,
-                    'game_context': self.conversation_state.game_context,
-                    'last_updated': self.conversation_state.last_updated.isoformat()
-                },
-                'context_items': {}
+        with self._save_cond:
+            self._save_generation += 1
+            generation = self._save_generation
+            snapshot = self._snapshot_state()
+            # The current state supersedes a request still waiting for the writer
+            self._save_pending = False
+        return self._write_snapshot(generation, snapshot)
+    
+    def request_save(self):
+        """Schedule a deferred save of the context state"""
+        with self._save_cond:
+            self._save_generation += 1
+            if self._save_closed:
+                return  # close() has already written; a later flush() picks this up
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(
+                    target=self._save_worker,
+                    daemon=True,
+                    name="ContextSaver"
+                )
+                self._save_thread.start()
+            if not self._save_pending:
+                self._save_pending = True
+                self._save_cond.notify()
+    
+    def flush(self) -> bool:
+        """
+        Synchronously save any pending context changes to disk
+        
+        Returns:
+            bool: True if save was successful
+        """
+        return self.save_context()
+    
+    def close(self) -> bool:
+        """
+        Stop the background writer and save the current context state
+        
+        Returns:
+            bool: True if the final save was successful
+        """
+        with self._save_cond:
+            self._save_closed = True
+            self._save_cond.notify()
+            save_thread = self._save_thread
+        if save_thread is not None:
+            save_thread.join()
+        return self.save_context()
+    
+    def _snapshot_state(self) -> Tuple[List[ChatMessage], Dict[str, Any], Dict[str, Any]]:
+        """
+        Copy the state to persist so the writer never reads structures
+        the caller keeps mutating; call with _state_lock held
+        
+        Returns:
+            Tuple of (conversation history, state data, context items data)
+        """
+        # Game contexts hold live structures such as the board, which the game keeps
+        # updating; a shared memo keeps a context shared by state and item shared in
+        # the copy. Chunk lists are replaced rather than modified, and messages never
+        # change after creation, so document contexts and the history are copied
+        # shallowly and cost nothing per chunk.
+        memo: Dict[int, Any] = {}
+        state = self.conversation_state
+        state_data = {
+            'current_mode': state.current_mode.value,
+            'active_document': state.active_document,
+            'active_game': state.active_game,
+            'document_context': self._copy_context_data(state.document_context, False, memo),
+            'game_context': self._copy_context_data(state.game_context, True, memo),
+            'last_updated': state.last_updated.isoformat()
+        }
+        
+        context_items_data = {}
+        for item_id, item in list(self.context_items.items()):
+            context_items_data[item_id] = {
+                'id': item.id,
+                'context_type': item.context_type.value,
+                'priority': item.priority.value,
+                'data': self._copy_context_data(item.data, item.context_type == ContextType.GAME, memo),
+                'created_at': item.created_at.isoformat(),
+                'last_accessed': item.last_accessed.isoformat(),
+                'access_count': item.access_count,
+                'expires_at': item.expires_at.isoformat() if item.expires_at else None
             }
+        
+        return list(state.conversation_history), state_data, context_items_data
+    
+    @staticmethod
+    def _copy_context_data(data: Optional[Dict[str, Any]], deep: bool,
+                           memo: Dict[int, Any]) -> Optional[Dict[str, Any]]:
+        """Copy context data for a snapshot, deeply only for mutable game state"""
+        if data is None:
+            return None
+        if deep:
+            return copy.deepcopy(data, memo)
+        return dict(data)
+    
+    def _write_snapshot(self, generation: int, snapshot: Tuple) -> bool:
+        """
+        Write a state snapshot to disk unless a newer one has already been written
+        
+        Args:
+            generation: Generation the snapshot was taken at
+            snapshot: Snapshot returned by _snapshot_state
             
-            # Serialize context items
-            for item_id, item in self.context_items.items():
-                context_data['context_items'][item_id] = {
-                    'id': item.id,
-                    'context_type': item.context_type.value,
-                    'priority': item.priority.value,
-                    'data': item.data,
-                    'created_at': item.created_at.isoformat(),
-                    'last_accessed': item.last_accessed.isoformat(),
-                    'access_count': item.access_count,
-                    'expires_at': item.expires_at.isoformat() if item.expires_at else None
-                }
-            
-            # Write to file
-            with open(self.context_file, 'w', encoding='utf-8') as f:
-                json.dump(context_data, f, indent=2, ensure_ascii=False)
+        Returns:
+            bool: True if the snapshot was written or superseded
+        """
+        history, state_data, context_items_data = snapshot
+        try:
+            with self._write_lock:
+                if generation <= self._written_generation:
+                    return True
+                
+                # Write to file, encoding one message at a time so the full
+                # history is never materialized as a list of dicts
+                with open(self.context_file, 'wb') as f:
+                    f.write(b'{"conversation_state":{"conversation_history":[')
+                    for i, msg in enumerate(history):
+                        if i:
+                            f.write(b',')
+                        f.write(_dumps(self._message_to_dict(msg)))
+                    f.write(b']')
+                    for key, value in state_data.items():
+                        f.write(b',' + _dumps(key) + b':' + _dumps(value))
+                    f.write(b'},"context_items":')
+                    f.write(_dumps(context_items_data))
+                    f.write(b'}')
+                
+                self._written_generation = generation
             
             self.logger.info("Context saved successfully")
             return True
@@ -423,8 +569,7 @@ class ContextManager:
                 self.logger.info("No existing context file found")
                 return True
             
-            with open(self.context_file, 'r', encoding='utf-8') as f:
-                context_data = json.load(f)
+            context_data = self._read_context_file()
             
             # Load conversation state
             conv_state_data = context_data.get('conversation_state', {})
@@ -443,7 +588,7 @@ class ContextManager:
             
             # Reconstruct conversation state
             self.conversation_state = ConversationState(
-                current_mode=ContextType(conv_state_data.get('current_mode', 'general')),
+                current_mode=_STR_CTX[conv_state_data.get('current_mode', 'general')],
                 active_document=conv_state_data.get('active_document'),
                 active_game=conv_state_data.get('active_game'),
                 conversation_history=conversation_history,
@@ -459,8 +604,8 @@ class ContextManager:
             for item_id, item_data in context_data.get('context_items', {}).items():
                 context_item = ContextItem(
                     id=item_data['id'],
-                    context_type=ContextType(item_data['context_type']),
-                    priority=ContextPriority(item_data['priority']),
+                    context_type=_STR_CTX[item_data['context_type']],
+                    priority=_INT_PRI[item_data['priority']],
                     data=item_data['data'],
                     created_at=datetime.fromisoformat(item_data['created_at']),
                     last_accessed=datetime.fromisoformat(item_data['last_accessed']),
@@ -480,6 +625,55 @@ class ContextManager:
             self.logger.error(f"Error loading context: {e}")
             return False
     
+    def _save_worker(self):
+        """Background writer that coalesces save requests until close()"""
+        while True:
+            with self._save_cond:
+                while not self._save_pending and not self._save_closed:
+                    self._save_cond.wait()
+                
+                # Let a burst of mutations settle before writing once
+                deadline = time.monotonic() + self.save_delay_seconds
+                while not self._save_closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
+                
+                if self._save_closed:
+                    return  # close() writes the current state
+                if not self._save_pending:
+                    continue  # save_context() wrote the state while we waited
+                self._save_pending = False
+                
+                # Snapshot here rather than in the mutators, which run on the UI thread
+                generation = self._save_generation
+                snapshot = self._snapshot_state()
+            
+            self._write_snapshot(generation, snapshot)
+    
+    def _message_to_dict(self, message: ChatMessage) -> Dict[str, Any]:
+        """Convert a chat message to its serialized form"""
+        return {
+            'id': message.id,
+            'sender': message.sender,
+            'content': message.content,
+            'timestamp': message.timestamp.isoformat(),
+            'context_type': message.context_type
+        }
+    
+    def _read_context_file(self) -> Dict[str, Any]:
+        """Read and parse the context file, memory-mapping large files"""
+        if ORJSON_AVAILABLE and self.context_file.stat().st_size > MMAP_THRESHOLD_BYTES:
+            # orjson parses straight from the mapped pages, skipping the str copy
+            with open(self.context_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+        
+        raw_data = self.context_file.read_bytes()
+        return orjson.loads(raw_data) if ORJSON_AVAILABLE else json.loads(raw_data)
+    
     def _save_current_context(self):
         """Save current context state"""
         self.conversation_state.last_updated = datetime.now()
@@ -524,36 +718,17 @@ class ContextManager:
         if self._estimate_memory_usage() > self.max_memory_bytes * self.cleanup_threshold:
             self._cleanup_low_priority_context()
     
-    def _get_recent_conversation(self, max_messages: int = 20) -> List[Dict[str, Any]]:
+    def _get_recent_conversation(self, max_messages: int = 20) -> List[ChatMessage]:
         """Get recent conversation messages"""
-        recent_messages = self.conversation_state.conversation_history[-max_messages:]
-        return [
-            {
-                'sender': msg.sender,
-                'content': msg.content,
-                'timestamp': msg.timestamp.isoformat(),
-                'context_type': msg.context_type
-            }
-            for msg in recent_messages
-        ]
+        return self.conversation_state.conversation_history[-max_messages:]
     
     def _is_document_query(self, query: str) -> bool:
         """Determine if query is document-related"""
-        doc_indicators = [
-            'document', 'doc', 'file', 'text', 'content', 'paper', 'article',
-            'what does', 'according to', 'in the', 'from the', 'based on'
-        ]
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in doc_indicators)
+        return _is_document_query_cached(query.lower())
     
     def _is_game_query(self, query: str) -> bool:
         """Determine if query is game-related"""
-        game_indicators = [
-            'game', 'play', 'move', 'turn', 'board', 'win', 'lose',
-            'tic-tac-toe', 'connect', 'battleship', 'strategy'
-        ]
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in game_indicators)
+        return _is_game_query_cached(query.lower())
     
     def _estimate_memory_usage(self) -> int:
         """Estimate current memory usage in bytes"""
@@ -563,7 +738,7 @@ class ContextManager:
             
             # Conversation history
             for msg in self.conversation_state.conversation_history:
-                memory_usage += len(msg.content.encode('utf-8'))
+                memory_usage += msg.byte_length
                 memory_usage += 200  # Overhead for message object
             
             # Context items
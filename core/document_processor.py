@@ -3,15 +3,31 @@ Document processing module for Zeus Virtual Assistant.
 Handles document upload, text extraction, chunking, and storage with comprehensive error handling.
 """
 import os
+import asyncio
+import atexit
+import codecs
+import heapq
 import logging
-import re
+import mmap
+import sys
+import threading
 import time
-from typing import Optional, List, Tuple, Callable, Dict, Any
+import weakref
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from typing import Optional, List, Tuple, Callable, Dict, Any, Iterable, Iterator
 from datetime import datetime
 from tkinter import filedialog, messagebox
 import PyPDF2
 from docx import Document as DocxDocument
 
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
 from models.data_models import Document
 from core.persistence import PersistenceManager
 from core.error_handler import ErrorHandler, ErrorCategory, ErrorSeverity, handle_errors, ProgressContext
@@ -20,6 +36,77 @@ from core.memory_optimizer import get_memory_optimizer
 from core.background_processor import get_background_processor
 
 
+def _page_may_contain_text(page) -> bool:
+    """Cheap probe for whether a PyMuPDF page can show any text at all."""
+    # Text needs a font, and fonts are listed in the resources without decoding any streams
+    if page.get_fonts():
+        return True
+    contents = page.read_contents()
+    return b"Tj" in contents or b"TJ" in contents
+
+
+def _extract_pdf_page_texts(pdf_doc, start: int, end: int) -> List[Optional[str]]:
+    """Extract text for pages [start, end) of an open PyMuPDF document (None for failed pages)."""
+    page_texts = []
+    for page_num in range(start, end):
+        try:
+            page = pdf_doc[page_num]
+            if not _page_may_contain_text(page):
+                # Image-only page (e.g. a scan): skip the extractor entirely
+                page_texts.append(None)
+                continue
+            page_texts.append(page.get_text("text"))
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not extract text from page {page_num + 1}: {str(e)}")
+            page_texts.append(None)
+    return page_texts
+
+
+def _extract_pdf_page_range(file_path: str, start: int, end: int) -> List[Optional[str]]:
+    """Process pool worker that extracts text for pages [start, end) of a PDF."""
+    # PyMuPDF documents cannot be shared across processes, so each worker reopens the file
+    with fitz.open(file_path) as pdf_doc:
+        return _extract_pdf_page_texts(pdf_doc, start, end)
+
+
+def _chunk_text_range(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """Process pool worker that chunks one batch of text, passed as its own slice."""
+    return list(DocumentProcessor._chunk_text_batch(text, chunk_size, overlap))
+
+
+def _docx_paragraph_texts(paragraphs) -> List[str]:
+    """Read the text of a run of python-docx paragraphs."""
+    return [paragraph.text for paragraph in paragraphs]
+
+
+def _docx_table_text(table) -> str:
+    """Flatten a python-docx table into ' | '-separated rows ('' for an empty table)."""
+    row_parts = []
+    for row in table.rows:
+        cell_texts = [cell.text for cell in row.cells]
+        row_text = "".join([text + " | " for text in cell_texts if text.strip()])
+        if row_text:
+            row_parts.append(row_text + "\n")
+    return "".join(row_parts)
+
+
+# Processors whose save thread has started; the writer is a daemon thread, so these are
+# closed at interpreter exit to write a deferred save before the thread is stopped
+_processors_with_writer = weakref.WeakSet()
+
+
+def _close_processors_at_exit():
+    """Drain the deferred saves of processors that were never closed."""
+    for processor in list(_processors_with_writer):
+        try:
+            processor.close()
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error saving documents at exit: {str(e)}")
+
+
+atexit.register(_close_processors_at_exit)
+
+
 class DocumentProcessor:
     """Handles document upload, text extraction, chunking, and storage with comprehensive error handling."""
     
@@ -27,12 +114,27 @@ class DocumentProcessor:
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB limit
     DEFAULT_CHUNK_SIZE = 1000  # characters per chunk
     CHUNK_OVERLAP = 200  # overlap between chunks
+    PARALLEL_PDF_PAGE_THRESHOLD = 32  # pages before PDF extraction uses worker processes
+    TXT_MMAP_THRESHOLD_BYTES = 1024 * 1024  # text files at least this large are memory-mapped
+    TXT_SEGMENT_BYTES = 64 * 1024  # bytes decoded per streamed plain text segment
+    PARALLEL_DOCX_PARAGRAPH_THRESHOLD = 1000  # paragraphs before DOCX extraction uses threads
+    PARALLEL_DOCX_TABLE_THRESHOLD = 4  # tables before DOCX extraction uses threads
+    DOCX_EXTRACTION_WORKERS = 4
+    PARALLEL_CHUNK_THRESHOLD_CHARS = 4 * 1024 * 1024  # text length before batches are chunked in worker processes
+    MEMORY_CHECK_INTERVAL_BATCHES = 16  # chunk batches between memory pressure checks
+    MEMORY_CHECK_INTERVAL_CHARS = 32 * 1024 * 1024  # characters chunked between memory pressure checks
+    ASYNC_EXTRACTION_MAX_INFLIGHT = 4  # documents parsed at once by extract_texts_aio
     
     def __init__(self, persistence_manager: Optional[PersistenceManager] = None, 
                  error_handler: Optional[ErrorHandler] = None):
         """Initialize the document processor."""
         self.current_document: Optional[Document] = None
         self.stored_documents: List[Document] = []
+        self._by_id: Dict[str, Document] = {}
+        self._by_path: Dict[str, Document] = {}
+        self._storage_summary_cache: Optional[str] = None
+        self._document_summary_cache: Optional[Tuple[str, str]] = None  # (document id, summary)
+        self._chunk_intern_table: Dict[str, str] = {}  # chunk text -> copy shared by every document
         self.persistence_manager = persistence_manager or PersistenceManager()
         self.error_handler = error_handler
         self.logger = logging.getLogger(__name__)
@@ -46,6 +148,19 @@ class DocumentProcessor:
         self.max_documents_in_memory = 5
         self.chunk_processing_batch_size = 100
         
+        # Deferred persistence: stores request a save and a background
+        # writer coalesces bursts of uploads into a single disk write.
+        # Every request bumps _save_generation; _saved_generation is the
+        # last one written, so flush() knows exactly what is still pending.
+        self.save_delay_seconds = 2.0
+        self._save_cond = threading.Condition()
+        self._write_lock = threading.Lock()  # serializes disk writes
+        self._save_generation = 0
+        self._saved_generation = 0
+        self._save_pending = False  # the writer has a request to pick up
+        self._save_closed = False
+        self._save_thread: Optional[threading.Thread] = None
+        
         # Load existing documents on initialization
         self._load_stored_documents()
         
@@ -82,8 +197,8 @@ class DocumentProcessor:
                 progress = self.error_handler.create_progress_indicator("Processing Document")
                 progress.show("Validating document...", indeterminate=True)
             
-            # Validate file
-            validation_result = self._validate_file(file_path)
+            # Validate file; the file work runs on the progress worker so the window stays responsive
+            validation_result = self._run_behind_progress(progress, self._validate_file, file_path)
             if not validation_result[0]:
                 if self.error_handler:
                     self.error_handler.handle_error(
@@ -103,14 +218,23 @@ class DocumentProcessor:
             
             filename = os.path.basename(file_path)
             file_size = os.path.getsize(file_path)
+            mtime = os.path.getmtime(file_path)
+            
+            # Reuse the stored document when the file has not changed since it was extracted
+            existing_doc = self.find_document_by_path(file_path)
+            if (existing_doc and existing_doc.chunks and existing_doc.mtime == mtime
+                    and existing_doc.file_size == file_size):
+                self.current_document = existing_doc
+                self.logger.info(f"Document unchanged since last upload, reusing stored copy: {filename}")
+                return existing_doc
             
             # Update progress
             if progress:
                 progress.update_message(f"Extracting text from {filename}...")
             
-            # Extract text with timeout for large files
-            text_content = self.extract_text(file_path)
-            if not text_content or not text_content.strip():
+            # Extract, chunk and index the text in one streaming pass
+            document = self._run_behind_progress(progress, self._build_document, file_path, file_size, mtime)
+            if document is None:
                 error_msg = "Could not extract text from the document. The file may be empty, corrupted, or password-protected."
                 if self.error_handler:
                     self.error_handler.handle_error(
@@ -128,21 +252,6 @@ class DocumentProcessor:
                     messagebox.showerror("Extraction Failed", error_msg)
                 return None
             
-            # Update progress
-            if progress:
-                progress.update_message("Creating document chunks...")
-            
-            # Create document object
-            document = Document(
-                filename=filename,
-                file_path=file_path,
-                text_content=text_content,
-                file_size=file_size
-            )
-            
-            # Chunk the document
-            document.chunks = self.chunk_document(text_content)
-            
             # Update progress
             if progress:
                 progress.update_message("Saving document...")
@@ -172,8 +281,7 @@ class DocumentProcessor:
             # Show success message briefly
             if progress:
                 progress.update_message(f"Document '{filename}' processed successfully!")
-                import time
-                time.sleep(1)
+                progress.run(time.sleep, 1)
             
             return document
             
@@ -210,6 +318,44 @@ class DocumentProcessor:
             if progress:
                 progress.hide()
     
+    @staticmethod
+    def _run_behind_progress(progress, func: Callable, *args) -> Any:
+        """Run func on the progress indicator's worker thread, or inline without an indicator."""
+        if progress:
+            return progress.run(func, *args)
+        return func(*args)
+    
+    def _build_document(self, file_path: str, file_size: int, mtime: float) -> Optional[Document]:
+        """
+        Extract, chunk and index a file into a new Document without storing it.
+        
+        Args:
+            file_path: Path to the document file
+            file_size: Size of the file in bytes
+            mtime: Modification time of the file
+            
+        Returns:
+            Document object, or None if no text could be extracted
+        """
+        chunks, char_count, word_count = self.extract_chunks(file_path)
+        if not chunks:
+            return None
+        
+        # Create document object; the chunks carry the text, so only its counts are kept
+        document = Document(
+            filename=os.path.basename(file_path),
+            file_path=file_path,
+            text_content=None,
+            char_count=char_count,
+            word_count=word_count,
+            chunks=chunks,
+            file_size=file_size,
+            mtime=mtime
+        )
+        self._index_chunks(document)
+        self._measure_chunks(document)
+        return document
+    
     @handle_errors(ErrorCategory.DOCUMENT, ErrorSeverity.ERROR, show_dialog=False, fallback_return="")
     def extract_text(self, file_path: str) -> str:
         """
@@ -221,23 +367,151 @@ class DocumentProcessor:
         Returns:
             Extracted text content as string
         """
+        return "".join(self._iter_text_segments(file_path)).strip()
+    
+    @handle_errors(ErrorCategory.DOCUMENT, ErrorSeverity.ERROR, show_dialog=False, fallback_return=([], 0, 0))
+    def extract_chunks(self, file_path: str) -> Tuple[List[str], int, int]:
+        """
+        Extract and chunk a document in a single streaming pass.
+        
+        Chunks are cut as pages and paragraphs arrive, and the full text is never
+        assembled; its character and word counts are taken along the way.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Returns:
+            Tuple of (text chunks, character count, word count)
+        """
+        counts = {}
+        segments = self._count_segments(self._iter_text_segments(file_path), counts)
+        chunks = self._chunk_stream(segments)
+        return chunks, counts['char_count'], counts['word_count']
+    
+    def _count_segments(self, segments: Iterable[str], counts: Dict[str, int]) -> Iterator[str]:
+        """
+        Pass text segments through, counting the characters and words of their joined,
+        stripped text into counts['char_count'] and counts['word_count'].
+        """
+        offset = 0
+        content_start = None
+        content_end = 0
+        word_count = 0
+        ends_in_word = False
+        
+        for segment in segments:
+            yield segment
+            length = len(segment)
+            if segment and not segment.isspace():
+                word_count += len(segment.split())
+                if ends_in_word and not segment[0].isspace():
+                    word_count -= 1  # the previous segment's last word continues here
+                
+                if content_start is None:
+                    lead = 0
+                    while segment[lead].isspace():
+                        lead += 1
+                    content_start = offset + lead
+                trail = length
+                while segment[trail - 1].isspace():
+                    trail -= 1
+                content_end = offset + trail
+                ends_in_word = trail == length
+            elif segment:
+                ends_in_word = False
+            offset += length
+        
+        counts['char_count'] = content_end - content_start if content_start is not None else 0
+        counts['word_count'] = word_count
+    
+    def _iter_text_segments(self, file_path: str) -> Iterator[str]:
+        """Yield the text of a document file segment by segment (pages, paragraphs, tables)."""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Document file not found: {file_path}")
         
         file_extension = os.path.splitext(file_path)[1].lower()
         
         if file_extension == '.pdf':
-            return self._extract_pdf_text(file_path)
+            return self._iter_pdf_segments(file_path)
         elif file_extension in ['.doc', '.docx']:
-            return self._extract_docx_text(file_path)
+            return self._iter_docx_segments(file_path)
         elif file_extension == '.txt':
-            return self._extract_txt_text(file_path)
+            return self._iter_txt_segments(file_path)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.SUPPORTED_FORMATS)}")
     
-    def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from PDF file using PyPDF2 with enhanced error handling."""
-        text_content = ""
+    def _iter_pdf_segments(self, file_path: str) -> Iterator[str]:
+        """Yield PDF page text, preferring PyMuPDF and falling back to PyPDF2."""
+        if PYMUPDF_AVAILABLE:
+            return self._iter_pdf_segments_pymupdf(file_path)
+        return self._iter_pdf_segments_pypdf2(file_path)
+    
+    def _iter_pdf_segments_pymupdf(self, file_path: str) -> Iterator[str]:
+        """Yield PDF page text using PyMuPDF's native text extractor."""
+        has_text = False
+        failed_pages = []
+        
+        try:
+            try:
+                pdf_doc = fitz.open(file_path)
+            except Exception as e:
+                raise ValueError(f"PDF file is corrupted or invalid: {str(e)}")
+            
+            with pdf_doc:
+                if pdf_doc.needs_pass:
+                    raise ValueError("PDF is password-protected. Please provide an unprotected version.")
+                
+                # Check if PDF has pages
+                page_count = pdf_doc.page_count
+                if page_count == 0:
+                    raise ValueError("PDF file contains no pages.")
+                
+                # Extract text from each page, spreading large documents across processes
+                page_texts = None
+                if page_count > self.PARALLEL_PDF_PAGE_THRESHOLD and (os.cpu_count() or 1) > 1:
+                    try:
+                        page_texts = self._extract_pdf_pages_parallel(file_path, page_count)
+                    except Exception as e:
+                        self.logger.warning(f"Parallel PDF extraction failed, falling back to serial: {str(e)}")
+                if page_texts is None:
+                    page_texts = _extract_pdf_page_texts(pdf_doc, 0, page_count)
+                
+                for page_num, page_text in enumerate(page_texts):
+                    if page_text and page_text.strip():
+                        has_text = True
+                        yield page_text + "\n"
+                    else:
+                        failed_pages.append(page_num + 1)
+                
+                self._report_failed_pages(failed_pages, page_count)
+                
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PDF file not found: {file_path}")
+        except PermissionError:
+            raise PermissionError(f"Permission denied accessing PDF file: {file_path}")
+        except Exception as e:
+            if "password" in str(e).lower():
+                raise ValueError("PDF is password-protected. Please provide an unprotected version.")
+            else:
+                raise ValueError(f"Error reading PDF file: {str(e)}")
+        
+        if not has_text:
+            raise ValueError("No readable text found in PDF. The document may contain only images.")
+    
+    def _extract_pdf_pages_parallel(self, file_path: str, page_count: int) -> List[Optional[str]]:
+        """Extract PDF page text in contiguous page ranges across a process pool."""
+        workers = min(os.cpu_count() or 1, page_count)
+        pages_per_worker = -(-page_count // workers)  # ceiling division
+        starts = list(range(0, page_count, pages_per_worker))
+        ends = [min(start + pages_per_worker, page_count) for start in starts]
+        
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            results = executor.map(_extract_pdf_page_range, [file_path] * len(starts), starts, ends)
+            return [page_text for page_range in results for page_text in page_range]
+    
+    def _iter_pdf_segments_pypdf2(self, file_path: str) -> Iterator[str]:
+        """Yield PDF page text using PyPDF2 with enhanced error handling."""
+        has_text = False
         failed_pages = []
         
         try:
@@ -258,26 +532,18 @@ class DocumentProcessor:
                 for page_num, page in enumerate(pdf_reader.pages):
                     try:
                         page_text = page.extract_text()
-                        if page_text and page_text.strip():
-                            text_content += page_text + "\n"
-                        else:
-                            failed_pages.append(page_num + 1)
                     except Exception as e:
                         self.logger.warning(f"Could not extract text from page {page_num + 1}: {str(e)}")
                         failed_pages.append(page_num + 1)
                         continue
+                    if page_text and page_text.strip():
+                        has_text = True
+                        yield page_text + "\n"
+                    else:
+                        failed_pages.append(page_num + 1)
                 
-                # Warn about failed pages if any
-                if failed_pages and self.error_handler:
-                    if len(failed_pages) == len(pdf_reader.pages):
-                        raise ValueError("Could not extract text from any pages. The PDF may contain only images or be corrupted.")
-                    elif len(failed_pages) > len(pdf_reader.pages) * 0.5:
-                        self.error_handler.handle_warning(
-                            f"Could not extract text from {len(failed_pages)} out of {len(pdf_reader.pages)} pages. The document may contain images or be partially corrupted.",
-                            ErrorCategory.DOCUMENT,
-                            show_dialog=False
-                        )
-                        
+                self._report_failed_pages(failed_pages, len(pdf_reader.pages))
+        
         except FileNotFoundError:
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         except PermissionError:
@@ -288,14 +554,24 @@ class DocumentProcessor:
             else:
                 raise ValueError(f"Error reading PDF file: {str(e)}")
         
-        if not text_content.strip():
+        if not has_text:
             raise ValueError("No readable text found in PDF. The document may contain only images.")
-        
-        return text_content.strip()
     
-    def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX file using python-docx with enhanced error handling."""
-        text_content = ""
+    def _report_failed_pages(self, failed_pages: List[int], page_count: int):
+        """Warn about PDF pages that yielded no text."""
+        if failed_pages and self.error_handler:
+            if len(failed_pages) == page_count:
+                raise ValueError("Could not extract text from any pages. The PDF may contain only images or be corrupted.")
+            elif len(failed_pages) > page_count * 0.5:
+                self.error_handler.handle_warning(
+                    f"Could not extract text from {len(failed_pages)} out of {page_count} pages. The document may contain images or be partially corrupted.",
+                    ErrorCategory.DOCUMENT,
+                    show_dialog=False
+                )
+    
+    def _iter_docx_segments(self, file_path: str) -> Iterator[str]:
+        """Yield paragraph and table text from a DOCX file using python-docx with enhanced error handling."""
+        has_text = False
         
         try:
             try:
@@ -308,27 +584,48 @@ class DocumentProcessor:
                 else:
                     raise ValueError(f"Cannot open Word document: {str(e)}")
             
-            # Extract text from paragraphs
-            paragraph_count = 0
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content += paragraph.text + "\n"
-                    paragraph_count += 1
-            
-            # Extract text from tables
-            table_count = 0
-            for table in doc.tables:
-                table_text = ""
-                for row in table.rows:
-                    row_text = ""
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text += cell.text + " | "
-                    if row_text:
-                        table_text += row_text + "\n"
-                if table_text:
-                    text_content += table_text + "\n"
-                    table_count += 1
+            paragraphs = doc.paragraphs
+            tables = doc.tables
+            parallel_paragraphs = len(paragraphs) > self.PARALLEL_DOCX_PARAGRAPH_THRESHOLD
+            parallel_tables = len(tables) > self.PARALLEL_DOCX_TABLE_THRESHOLD
+            
+            # Large documents read paragraph ranges and tables on worker threads; results keep document order
+            executor = None
+            if parallel_paragraphs or parallel_tables:
+                executor = ThreadPoolExecutor(max_workers=self.DOCX_EXTRACTION_WORKERS)
+            try:
+                # Submit tables first so they are read while paragraphs are being consumed
+                if parallel_tables:
+                    table_texts = executor.map(_docx_table_text, tables)
+                else:
+                    table_texts = map(_docx_table_text, tables)
+                
+                if parallel_paragraphs:
+                    per_worker = -(-len(paragraphs) // self.DOCX_EXTRACTION_WORKERS)  # ceiling division
+                    paragraph_ranges = [paragraphs[i:i + per_worker] for i in range(0, len(paragraphs), per_worker)]
+                    paragraph_texts = (text for texts in executor.map(_docx_paragraph_texts, paragraph_ranges)
+                                       for text in texts)
+                else:
+                    paragraph_texts = (paragraph.text for paragraph in paragraphs)
+                
+                # Extract text from paragraphs
+                paragraph_count = 0
+                for paragraph_text in paragraph_texts:
+                    if paragraph_text.strip():
+                        has_text = True
+                        yield paragraph_text + "\n"
+                        paragraph_count += 1
+                
+                # Extract text from tables
+                table_count = 0
+                for table_text in table_texts:
+                    if table_text:
+                        has_text = True
+                        yield table_text + "\n"
+                        table_count += 1
+            finally:
+                if executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
             
             # Log extraction statistics
             self.logger.info(f"Extracted text from {paragraph_count} paragraphs and {table_count} tables")
@@ -340,33 +637,77 @@ class DocumentProcessor:
         except Exception as e:
             raise ValueError(f"Error reading Word document: {str(e)}")
         
-        if not text_content.strip():
+        if not has_text:
             raise ValueError("No readable text found in Word document. The document may be empty.")
-        
-        return text_content.strip()
     
-    def _extract_txt_text(self, file_path: str) -> str:
-        """Extract text from plain text file"""
+    def _iter_txt_segments(self, file_path: str) -> Iterator[str]:
+        """Yield the text of a plain text file segment by segment, decoding one block at a time"""
+        block_size = self.TXT_SEGMENT_BYTES
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text_content = file.read()
-            
-            if not text_content.strip():
-                raise ValueError("Text file is empty.")
-            
-            return text_content.strip()
-            
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(file_path, 'r', encoding='latin-1') as file:
-                    text_content = file.read()
-                return text_content.strip()
-            except Exception as e:
-                raise ValueError(f"Cannot read text file with any encoding: {str(e)}")
+            with open(file_path, 'rb') as file:
+                file_size = os.fstat(file.fileno()).st_size
+                if file_size >= self.TXT_MMAP_THRESHOLD_BYTES:
+                    # Decode straight from the mapping instead of copying into a read buffer first
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        blocks = (mapped[pos:pos + block_size] for pos in range(0, file_size, block_size))
+                        yield from self._decode_text_blocks(blocks)
+                else:
+                    yield from self._decode_text_blocks(iter(lambda: file.read(block_size), b''))
+        
         except Exception as e:
             raise ValueError(f"Error reading text file: {str(e)}")
     
+    @staticmethod
+    def _decode_text_blocks(blocks: Iterable[bytes]) -> Iterator[str]:
+        """
+        Decode byte blocks as UTF-8 text with newlines normalized the way text-mode reads did.
+        
+        Falls back to latin-1 from the first block that is not valid UTF-8; latin-1 maps
+        every byte, so the file never needs to be reopened. A file whose earlier blocks
+        were ASCII decodes exactly as a whole-file latin-1 decode would.
+        
+        Args:
+            blocks: File contents in order
+            
+        Returns:
+            Iterator over decoded text segments
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        using_utf8 = True
+        held_cr = ""  # a trailing \r might be the first half of a \r\n split across blocks
+        has_text = False
+        
+        for block in chain(blocks, (None,)):
+            final = block is None
+            data = b"" if final else block
+            try:
+                text = decoder.decode(data, final)
+            except UnicodeDecodeError:
+                if not using_utf8:
+                    raise
+                # Replay the bytes the UTF-8 decoder held back for a split character
+                data = decoder.getstate()[0] + data
+                decoder = codecs.getincrementaldecoder('latin-1')('replace')
+                using_utf8 = False
+                text = decoder.decode(data, final)
+            
+            text = held_cr + text
+            held_cr = ""
+            if text.endswith('\r') and not final:
+                held_cr = '\r'
+                text = text[:-1]
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            
+            if text:
+                has_text = has_text or not text.isspace()
+                yield text
+        
+        if not has_text:
+            raise ValueError("Text file is empty.")
+    
     def _validate_file(self, file_path: str) -> Tuple[bool, str]:
         """
         Validate uploaded file for format and size constraints.
@@ -430,29 +771,82 @@ class DocumentProcessor:
         # Ensure overlap is not larger than chunk size
         overlap = min(overlap, chunk_size // 2)
         
-        chunks = []
-        start = 0
+        # Slice the text only once per chunk, after all cut points are known,
+        # into a list sized up front from the offset count
+        offsets = self._chunk_offsets(text, chunk_size, overlap)
+        chunks = [None] * len(offsets)
+        chunk_count = 0
+        for start, end in offsets:
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks[chunk_count] = chunk
+                chunk_count += 1
+        del chunks[chunk_count:]
+        
+        self.logger.info(f"Document chunked into {len(chunks)} chunks")
+        return chunks
+    
+    def _chunk_offsets(self, text: str, chunk_size: int, overlap: int) -> List[Tuple[int, int]]:
+        """
+        Compute (start, end) offsets of overlapping chunks in a single pass.
+        
+        Args:
+            text: The text content to chunk
+            chunk_size: Maximum characters per chunk
+            overlap: Characters to overlap between chunks
+            
+        Returns:
+            List of (start, end) offsets into text
+        """
+        offsets = []
+        self._advance_chunk_offsets(text, 0, len(text), chunk_size, overlap, offsets, final=True)
+        return offsets
+    
+    @classmethod
+    def _advance_chunk_offsets(cls, text: str, start: int, text_length: int, chunk_size: int,
+                               overlap: int, offsets: List[Tuple[int, int]], final: bool) -> int:
+        """
+        Append chunk offsets from start onwards, stopping early on partial text.
+        
+        Args:
+            text: The text content to chunk
+            start: Offset of the next chunk
+            text_length: Length of the content in text
+            chunk_size: Maximum characters per chunk
+            overlap: Characters to overlap between chunks
+            offsets: List the (start, end) offsets are appended to
+            final: Whether text_length is the end of the document; when False, stops
+                before any chunk whose end depends on text not yet available
+            
+        Returns:
+            Offset of the first chunk not yet appended
+        """
+        if chunk_size == 1000 and overlap == 200:
+            return cls._advance_default_chunk_offsets(text, start, text_length, offsets, final)
+        
+        find_sentence_boundary = cls._find_sentence_boundary
+        find_word_boundary = cls._find_word_boundary
+        append = offsets.append
         
-        while start < len(text):
+        while start < text_length:
             # Calculate end position
             end = start + chunk_size
             
             # If this is not the last chunk, try to break at a sentence or word boundary
-            if end < len(text):
+            if end < text_length:
                 # Look for sentence boundary (. ! ?) within the last 100 characters
-                sentence_end = self._find_sentence_boundary(text, end - 100, end)
+                sentence_end = find_sentence_boundary(text, end - 100, end)
                 if sentence_end > start:
                     end = sentence_end
                 else:
                     # Look for word boundary within the last 50 characters
-                    word_end = self._find_word_boundary(text, end - 50, end)
+                    word_end = find_word_boundary(text, end - 50, end)
                     if word_end > start:
                         end = word_end
+            elif not final:
+                break
             
-            # Extract chunk
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+            append((start, end))
             
             # Move start position with overlap
             start = end - overlap
@@ -461,26 +855,116 @@ class DocumentProcessor:
             if start >= end:
                 start = end
         
+        return start
+    
+    @staticmethod
+    def _advance_default_chunk_offsets(text: str, start: int, text_length: int,
+                                       offsets: List[Tuple[int, int]], final: bool) -> int:
+        """
+        _advance_chunk_offsets specialized for the default 1000/200 chunking.
+        
+        Every boundary window lies at least 900 characters past start, so the range
+        clamps, the "boundary > start" checks and the progress guard all drop out,
+        and the boundary probes are inlined.
+        """
+        rfind = text.rfind
+        append = offsets.append
+        
+        while start < text_length:
+            end = start + 1000
+            
+            if end < text_length:
+                # Sentence boundary within the last 100 characters, else word boundary within the last 50
+                window_start = end - 100
+                boundary = max(rfind('. ', window_start, end), rfind('! ', window_start, end),
+                               rfind('? ', window_start, end), rfind('.\n', window_start, end),
+                               rfind('!\n', window_start, end), rfind('?\n', window_start, end))
+                if boundary >= 0:
+                    end = boundary + 2
+                else:
+                    window_start = end - 50
+                    boundary = max(rfind(' ', window_start, end), rfind('\n', window_start, end))
+                    if boundary >= 0:
+                        end = boundary
+            elif not final:
+                break
+            
+            append((start, end))
+            start = end - 200
+        
+        return start
+    
+    def _chunk_stream(self, segments: Iterable[str], chunk_size: int = None, overlap: int = None) -> List[str]:
+        """
+        Chunk text as it is extracted, keeping only a rolling window in memory.
+        
+        Produces the same chunks as chunk_document on the joined, stripped segments.
+        
+        Args:
+            segments: Text segments in document order
+            chunk_size: Maximum characters per chunk (default: DEFAULT_CHUNK_SIZE)
+            overlap: Characters to overlap between chunks (default: CHUNK_OVERLAP)
+            
+        Returns:
+            List of text chunks
+        """
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        overlap = overlap or self.CHUNK_OVERLAP
+        overlap = min(overlap, chunk_size // 2)
+        
+        chunks = []
+        offsets = []
+        window = ""
+        start = 0
+        
+        for segment in segments:
+            if not window:
+                # Leading whitespace is stripped from the document
+                segment = segment.lstrip()
+            window += segment
+            
+            # Trailing whitespace may still be followed by text, so it cannot end a chunk yet
+            content_length = len(window.rstrip())
+            start = self._advance_chunk_offsets(window, start, content_length, chunk_size,
+                                                overlap, offsets, final=False)
+            self._append_chunks(window, offsets, chunks)
+            
+            # Keep one character before start so a terminator straddling it is still found
+            keep_from = max(0, start - 1)
+            window = window[keep_from:]
+            start -= keep_from
+        
+        window = window.rstrip()
+        self._advance_chunk_offsets(window, start, len(window), chunk_size, overlap, offsets, final=True)
+        self._append_chunks(window, offsets, chunks)
+        
         self.logger.info(f"Document chunked into {len(chunks)} chunks")
         return chunks
     
-    def _find_sentence_boundary(self, text: str, start: int, end: int) -> int:
+    def _append_chunks(self, text: str, offsets: List[Tuple[int, int]], chunks: List[str]):
+        """Slice pending offsets out of text into chunks and clear them."""
+        append = chunks.append
+        for start, end in offsets:
+            chunk = text[start:end].strip()
+            if chunk:
+                append(chunk)
+        offsets.clear()
+    
+    @staticmethod
+    def _find_sentence_boundary(text: str, start: int, end: int) -> int:
         """Find the last sentence boundary within the given range."""
-        sentence_endings = re.finditer(r'[.!?]\s+', text[start:end])
-        boundaries = list(sentence_endings)
-        if boundaries:
-            last_boundary = boundaries[-1]
-            return start + last_boundary.end()
-        return -1
-    
-    def _find_word_boundary(self, text: str, start: int, end: int) -> int:
+        start = max(0, start)
+        # Sentence terminators are punctuation plus following whitespace; each probe is a C-level rfind
+        rfind = text.rfind
+        boundary = max(rfind('. ', start, end), rfind('! ', start, end), rfind('? ', start, end),
+                       rfind('.\n', start, end), rfind('!\n', start, end), rfind('?\n', start, end))
+        return boundary + 2 if boundary >= 0 else -1
+    
+    @staticmethod
+    def _find_word_boundary(text: str, start: int, end: int) -> int:
         """Find the last word boundary within the given range."""
-        word_boundaries = re.finditer(r'\s+', text[start:end])
-        boundaries = list(word_boundaries)
-        if boundaries:
-            last_boundary = boundaries[-1]
-            return start + last_boundary.start()
-        return -1
+        start = max(0, start)
+        return max(text.rfind(' ', start, end), text.rfind('\n', start, end))
     
     def _store_document(self, document: Document) -> bool:
         """
@@ -490,7 +974,7 @@ class DocumentProcessor:
             document: Document to store
             
         Returns:
-            True if successful, False otherwise
+            True if the document was stored and its save scheduled, False otherwise
         """
         try:
             # Check if document already exists (by filename and file_path)
@@ -498,23 +982,122 @@ class DocumentProcessor:
             if existing_doc:
                 # Update existing document
                 self.stored_documents.remove(existing_doc)
+                self._by_id.pop(existing_doc.id, None)
             
             # Add new document
             self.stored_documents.append(document)
-            
-            # Save to persistent storage
-            success = self.persistence_manager.save_documents(self.stored_documents)
-            if success:
-                self.logger.info(f"Document stored successfully: {document.filename}")
+            self._by_id[document.id] = document
+            self._by_path[document.file_path] = document
+            if existing_doc and existing_doc is not document:
+                self._rebuild_chunk_intern_table()
             else:
-                self.logger.error(f"Failed to save document: {document.filename}")
+                self._intern_chunks(document)
+            self._invalidate_summaries()
             
-            return success
+            # Save to persistent storage once the current burst of uploads settles.
+            # The write happens later, so a disk failure is not reported here: the
+            # writer logs it and warns through the error handler, and flush()/close()
+            # return False until a later save succeeds.
+            self.request_save()
+            self.logger.info(f"Document stored successfully: {document.filename}")
+            
+            return True
             
         except Exception as e:
             self.logger.error(f"Error storing document: {str(e)}")
             return False
     
+    def request_save(self):
+        """Schedule a deferred save of the stored documents"""
+        with self._save_cond:
+            self._save_generation += 1
+            if self._save_closed:
+                return  # close() has already written; a later flush() picks this up
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(
+                    target=self._save_worker,
+                    daemon=True,
+                    name="DocumentSaver"
+                )
+                self._save_thread.start()
+                _processors_with_writer.add(self)
+            if not self._save_pending:
+                self._save_pending = True
+                self._save_cond.notify()
+    
+    def flush(self) -> bool:
+        """
+        Synchronously save any pending document changes to disk
+        
+        Waits for a write the background writer has already started, then
+        writes whatever that write did not cover.
+        
+        Returns:
+            True if nothing was pending or the save was successful
+        """
+        return self._write_pending()
+    
+    def close(self) -> bool:
+        """
+        Stop the background writer and save any pending document changes
+        
+        Returns:
+            True if nothing was pending or the final save was successful
+        """
+        with self._save_cond:
+            self._save_closed = True
+            self._save_cond.notify()
+            save_thread = self._save_thread
+        if save_thread is not None:
+            save_thread.join()
+        _processors_with_writer.discard(self)
+        return self._write_pending()
+    
+    def _write_pending(self) -> bool:
+        """Write the stored documents if a requested save has not been written yet"""
+        with self._write_lock:
+            with self._save_cond:
+                generation = self._save_generation
+                if generation == self._saved_generation:
+                    return True
+                documents = list(self.stored_documents)
+            
+            success = self.persistence_manager.save_documents(documents)
+            if success:
+                with self._save_cond:
+                    self._saved_generation = generation
+                return True
+        
+        self.logger.error("Failed to save stored documents")
+        if self.error_handler:
+            self.error_handler.handle_warning(
+                "Stored documents could not be saved to disk. Please check disk space and permissions.",
+                ErrorCategory.FILE_IO,
+                show_dialog=False
+            )
+        return False
+    
+    def _save_worker(self):
+        """Background writer that coalesces save requests until close()"""
+        while True:
+            with self._save_cond:
+                while not self._save_pending and not self._save_closed:
+                    self._save_cond.wait()
+                
+                # Let a burst of uploads settle before writing once
+                deadline = time.monotonic() + self.save_delay_seconds
+                while not self._save_closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
+                
+                if self._save_closed:
+                    return  # close() writes whatever is still pending
+                self._save_pending = False
+            
+            self._write_pending()
+    
     def _load_stored_documents(self):
         """Load all stored documents from persistent storage."""
         try:
@@ -523,6 +1106,27 @@ class DocumentProcessor:
         except Exception as e:
             self.logger.error(f"Error loading stored documents: {str(e)}")
             self.stored_documents = []
+        
+        self._by_id = {doc.id: doc for doc in self.stored_documents}
+        self._by_path = {doc.file_path: doc for doc in self.stored_documents}
+        self._rebuild_chunk_intern_table()
+    
+    def _intern_chunks(self, document: Document):
+        """
+        Replace a document's chunks with the shared copies of identical chunks.
+        
+        Args:
+            document: Document whose chunks should be deduplicated
+        """
+        # A str key caches its hash, so repeated lookups never rehash chunk text
+        setdefault = self._chunk_intern_table.setdefault
+        document.chunks = [setdefault(chunk, chunk) for chunk in document.chunks]
+    
+    def _rebuild_chunk_intern_table(self):
+        """Rebuild the chunk intern table so it only holds chunks of stored documents."""
+        self._chunk_intern_table = {}
+        for doc in self.stored_documents:
+            self._intern_chunks(doc)
     
     def get_stored_documents(self) -> List[Document]:
         """Get all stored documents."""
@@ -530,24 +1134,18 @@ class DocumentProcessor:
     
     def find_document_by_id(self, document_id: str) -> Optional[Document]:
         """Find a stored document by its ID."""
-        for doc in self.stored_documents:
-            if doc.id == document_id:
-                return doc
-        return None
+        return self._by_id.get(document_id)
     
     def find_document_by_path(self, file_path: str) -> Optional[Document]:
         """Find a stored document by its file path."""
-        for doc in self.stored_documents:
-            if doc.file_path == file_path:
-                return doc
-        return None
+        return self._by_path.get(file_path)
     
     def find_documents_by_filename(self, filename: str) -> List[Document]:
         """Find stored documents by filename (partial match)."""
         matching_docs = []
         filename_lower = filename.lower()
         for doc in self.stored_documents:
-            if filename_lower in doc.filename.lower():
+            if filename_lower in doc.filename_lower:
                 matching_docs.append(doc)
         return matching_docs
     
@@ -567,13 +1165,19 @@ class DocumentProcessor:
                 return False
             
             self.stored_documents.remove(doc_to_remove)
+            del self._by_id[document_id]
+            if self._by_path.get(doc_to_remove.file_path) is doc_to_remove:
+                del self._by_path[doc_to_remove.file_path]
+            self._rebuild_chunk_intern_table()
+            self._invalidate_summaries()
             
             # Clear current document if it's the one being removed
             if self.current_document and self.current_document.id == document_id:
                 self.current_document = None
             
-            # Save updated list
-            success = self.persistence_manager.save_documents(self.stored_documents)
+            # Save updated list, including any store still waiting to be written
+            self.request_save()
+            success = self.flush()
             if success:
                 self.logger.info(f"Document removed successfully: {doc_to_remove.filename}")
             
@@ -594,26 +1198,62 @@ class DocumentProcessor:
         Returns:
             List of tuples (chunk_text, document_filename)
         """
-        if not self.current_document or not self.current_document.chunks:
+        document = self.current_document
+        if not document or not document.chunks:
             return []
         
-        query_words = set(query.lower().split())
-        chunk_scores = []
+        # Loaded or trimmed documents are (re)indexed on first use
+        if document.indexed_chunk_count != len(document.chunks):
+            self._index_chunks(document)
         
-        for chunk in self.current_document.chunks:
-            chunk_words = set(chunk.lower().split())
-            # Simple scoring based on word overlap
-            score = len(query_words.intersection(chunk_words))
-            if score > 0:
-                chunk_scores.append((score, chunk))
+        # Simple scoring based on word overlap, visiting only chunks that share a word;
+        # interned query words hit index keys by identity
+        query_words = {sys.intern(word) for word in query.lower().split()}
+        scores = Counter()
+        for word in query_words:
+            scores.update(document.inverted_index.get(word, ()))
         
-        # Sort by score and return top chunks
-        chunk_scores.sort(key=lambda x: x[0], reverse=True)
-        relevant_chunks = [(chunk, self.current_document.filename) 
-                          for _, chunk in chunk_scores[:max_chunks]]
+        # Select top chunks by score (ties in document order) without a full sort
+        chunk_scores = [(score, chunk_idx) for chunk_idx, score in scores.items()]
+        top_scores = heapq.nlargest(max_chunks, chunk_scores, key=lambda x: (x[0], -x[1]))
+        relevant_chunks = [(document.chunks[chunk_idx], document.filename) 
+                          for _, chunk_idx in top_scores]
         
         return relevant_chunks
     
+    def _index_chunks(self, document: Document):
+        """
+        Build the inverted token index used by find_relevant_chunks.
+        
+        Args:
+            document: Document whose chunks should be indexed
+        """
+        # Tokens are interned so every document and query shares one object per word
+        intern = sys.intern
+        inverted_index = defaultdict(list)
+        for chunk_idx, chunk in enumerate(document.chunks):
+            for token in frozenset(chunk.lower().split()):
+                inverted_index[intern(token)].append(chunk_idx)
+        
+        document.inverted_index = dict(inverted_index)
+        document.indexed_chunk_count = len(document.chunks)
+    
+    @staticmethod
+    def _utf8_size(text: str) -> int:
+        """Return the UTF-8 size of text, skipping the encode for ASCII text"""
+        return len(text) if text.isascii() else len(text.encode('utf-8'))
+    
+    def _measure_chunks(self, document: Document):
+        """
+        Cache the total UTF-8 size of the chunks used by get_processing_statistics.
+        
+        Args:
+            document: Document whose chunks should be measured
+        """
+        # Reduced once here so statistics add one total per document, not one size per chunk
+        document.chunk_utf8_bytes = sum(map(self._utf8_size, document.chunks))
+        document.measured_chunk_count = len(document.chunks)
+    
     def get_document_summary(self) -> str:
         """
         Get a summary of the current document.
@@ -625,16 +1265,19 @@ class DocumentProcessor:
             return "No document loaded."
         
         doc = self.current_document
-        word_count = len(doc.text_content.split())
-        char_count = len(doc.text_content)
+        if self._document_summary_cache and self._document_summary_cache[0] == doc.id:
+            return self._document_summary_cache[1]
+        
         chunk_count = len(doc.chunks)
         
-        return (f"Document: {doc.filename}\n"
-                f"Size: {doc.file_size // 1024}KB\n"
-                f"Words: {word_count:,}\n"
-                f"Characters: {char_count:,}\n"
-                f"Chunks: {chunk_count}\n"
-                f"Uploaded: {doc.upload_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        summary = (f"Document: {doc.filename}\n"
+                   f"Size: {doc.file_size // 1024}KB\n"
+                   f"Words: {doc.word_count:,}\n"
+                   f"Characters: {doc.char_count:,}\n"
+                   f"Chunks: {chunk_count}\n"
+                   f"Uploaded: {doc.upload_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        self._document_summary_cache = (doc.id, summary)
+        return summary
     
     def get_storage_summary(self) -> str:
         """
@@ -646,6 +1289,9 @@ class DocumentProcessor:
         if not self.stored_documents:
             return "No documents stored."
         
+        if self._storage_summary_cache is not None:
+            return self._storage_summary_cache
+        
         total_size = sum(doc.file_size for doc in self.stored_documents)
         total_chunks = sum(len(doc.chunks) for doc in self.stored_documents)
         
@@ -656,7 +1302,13 @@ class DocumentProcessor:
         for doc in self.stored_documents:
             summary += f"• {doc.filename} ({len(doc.chunks)} chunks)\n"
         
-        return summary  
+        self._storage_summary_cache = summary
+        return summary
+    
+    def _invalidate_summaries(self):
+        """Drop cached summaries after stored documents or their chunks change."""
+        self._storage_summary_cache = None
+        self._document_summary_cache = None  
   
     def _handle_memory_optimization(self, optimization_type: str):
         """
@@ -683,14 +1335,9 @@ class DocumentProcessor:
         )
         
         if optimized_count > 0:
+            self._rebuild_chunk_intern_table()
+            self._invalidate_summaries()
             self.logger.info(f"Optimized {optimized_count} documents for memory usage")
-        
-        # Clear current document content if memory pressure is high
-        if self.memory_optimizer.check_memory_pressure() and self.current_document:
-            if hasattr(self.current_document, 'text_content'):
-                # Keep chunks but clear full text content
-                self.current_document.text_content = None
-                self.logger.info("Cleared current document text content to save memory")
     
     def upload_document_async(self, callback: Optional[Callable] = None, 
                              error_callback: Optional[Callable] = None,
@@ -771,6 +1418,62 @@ class DocumentProcessor:
             progress_callback=progress_callback
         )
     
+    async def extract_text_aio(self, file_path: str,
+                               progress_callback: Optional[Callable] = None,
+                               semaphore: Optional[asyncio.Semaphore] = None) -> str:
+        """
+        Extract text from a document as an asyncio coroutine
+        
+        Parsing runs in the event loop's default executor; progress callbacks run
+        on the event loop thread.
+        
+        Args:
+            file_path: Path to document file
+            progress_callback: Progress callback function
+            semaphore: Optional semaphore bounding concurrent extractions
+            
+        Returns:
+            Extracted text content as string
+        """
+        if semaphore is None:
+            return await self._extract_text_in_executor(file_path, progress_callback)
+        async with semaphore:
+            return await self._extract_text_in_executor(file_path, progress_callback)
+    
+    async def extract_texts_aio(self, file_paths: List[str], max_inflight: int = None) -> List[str]:
+        """
+        Extract text from several documents concurrently
+        
+        Args:
+            file_paths: Paths to document files
+            max_inflight: Maximum documents parsed at once
+            
+        Returns:
+            Extracted text content for each file, in order
+        """
+        semaphore = asyncio.Semaphore(max_inflight or self.ASYNC_EXTRACTION_MAX_INFLIGHT)
+        return list(await asyncio.gather(
+            *(self.extract_text_aio(file_path, semaphore=semaphore) for file_path in file_paths)
+        ))
+    
+    async def _extract_text_in_executor(self, file_path: str,
+                                        progress_callback: Optional[Callable] = None) -> str:
+        """Run extract_text in the default executor, recording its response time."""
+        if progress_callback:
+            progress_callback(0.2, "Starting text extraction...")
+        
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        text_content = await loop.run_in_executor(None, self.extract_text, file_path)
+        
+        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        self.performance_monitor.record_response_time(processing_time)
+        
+        if progress_callback:
+            progress_callback(1.0, "Text extraction completed")
+        
+        return text_content
+    
     def chunk_document_optimized(self, text: str, chunk_size: int = None, 
                                 overlap: int = None, 
                                 progress_callback: Optional[Callable] = None) -> List[str]:
@@ -786,88 +1489,150 @@ class DocumentProcessor:
         Returns:
             List of text chunks
         """
-        if not text.strip():
-            return []
+        chunks = list(self.iter_chunks(text, chunk_size, overlap, progress_callback))
         
+        self.logger.info(f"Document chunked into {len(chunks)} chunks (optimized)")
+        return chunks
+    
+    def iter_chunks(self, text: str, chunk_size: int = None,
+                    overlap: int = None,
+                    progress_callback: Optional[Callable] = None) -> Iterator[str]:
+        """
+        Optimized document chunking that yields chunks batch by batch, so callers
+        can consume them without holding the whole chunk list
+        
+        Args:
+            text: Text content to chunk
+            chunk_size: Maximum characters per chunk
+            overlap: Characters to overlap between chunks
+            progress_callback: Progress callback function
+            
+        Returns:
+            Iterator over text chunks in document order
+        """
         chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
         overlap = overlap or self.CHUNK_OVERLAP
         
-        # Use memory optimizer for string optimization
-        optimized_text = self.memory_optimizer.optimize_string_memory([text])[0]
+        # Text that ends before the second chunk would start is a single chunk, so no
+        # batching or boundary search is needed
+        if len(text) <= chunk_size - overlap:
+            chunk = text.strip()
+            if chunk:
+                yield chunk
+                if progress_callback:
+                    progress_callback(1.0, f"Processed {len(text)}/{len(text)} characters")
+            return
         
-        # Process in batches to manage memory
-        chunks = []
-        start = 0
-        total_length = len(optimized_text)
-        processed_chars = 0
+        if not text.strip():
+            return
         
-        while start < total_length:
-            # Calculate batch end
-            batch_end = min(start + chunk_size * self.chunk_processing_batch_size, total_length)
-            batch_text = optimized_text[start:batch_end]
-            
-            # Process batch
-            batch_chunks = self._chunk_text_batch(batch_text, chunk_size, overlap, start)
-            chunks.extend(batch_chunks)
+        # Process in batches to manage memory; batches are offset ranges into the
+        # text rather than copies of it. The text itself is used as-is: interning
+        # only pays off for small repeated strings, never for a whole document
+        total_length = len(text)
+        batch_ranges = self._batch_ranges(total_length, chunk_size, overlap)
+        
+        batch_results = None
+        if total_length >= self.PARALLEL_CHUNK_THRESHOLD_CHARS and len(batch_ranges) > 1 and (os.cpu_count() or 1) > 1:
+            try:
+                batch_results = self._chunk_batches_parallel(text, batch_ranges, chunk_size, overlap)
+            except Exception as e:
+                self.logger.warning(f"Parallel chunking failed, falling back to serial: {str(e)}")
+        if batch_results is None:
+            batch_results = (self._chunk_text_batch(text, chunk_size, overlap, start, batch_end)
+                             for start, batch_end in batch_ranges)
+        
+        batches_since_check = 0
+        last_check_chars = 0
+        
+        for (start, batch_end), batch_chunks in zip(batch_ranges, batch_results):
+            yield from batch_chunks
             
             # Update progress
-            processed_chars += len(batch_text)
+            processed_chars = batch_end
             if progress_callback:
                 progress = processed_chars / total_length
                 progress_callback(progress, f"Processed {processed_chars}/{total_length} characters")
             
-            # Move to next batch
-            start = batch_end - overlap
-            
-            # Check memory pressure and optimize if needed
-            if self.memory_optimizer.check_memory_pressure():
-                self.memory_optimizer.force_garbage_collection()
-        
-        self.logger.info(f"Document chunked into {len(chunks)} chunks (optimized)")
-        return chunks
+            # Check memory pressure and optimize if needed; sampled, since each check queries the process RSS
+            batches_since_check += 1
+            if batch_end < total_length and (batches_since_check >= self.MEMORY_CHECK_INTERVAL_BATCHES or
+                                             processed_chars - last_check_chars >= self.MEMORY_CHECK_INTERVAL_CHARS):
+                batches_since_check = 0
+                last_check_chars = processed_chars
+                if self.memory_optimizer.check_memory_pressure():
+                    self.memory_optimizer.force_garbage_collection()
     
-    def _chunk_text_batch(self, text: str, chunk_size: int, overlap: int, offset: int = 0) -> List[str]:
+    def _batch_ranges(self, total_length: int, chunk_size: int, overlap: int) -> List[Tuple[int, int]]:
         """
-        Chunk a batch of text
+        Split the text into batch offset ranges; each batch starts overlap characters
+        before the previous one ends, so batches can be chunked independently
         
         Args:
-            text: Text to chunk
+            total_length: Length of the text
             chunk_size: Chunk size
             overlap: Overlap size
-            offset: Offset for boundary detection
             
         Returns:
-            List of chunks
+            List of (start, end) batch offsets
         """
-        chunks = []
+        batch_chars = chunk_size * self.chunk_processing_batch_size
+        ranges = []
         start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
+        while start < total_length:
+            batch_end = min(start + batch_chars, total_length)
+            ranges.append((start, batch_end))
             
-            # Find good boundary if not at end
-            if end < len(text):
-                # Look for sentence boundary
-                sentence_end = self._find_sentence_boundary(text, max(0, end - 100), end)
-                if sentence_end > start:
-                    end = sentence_end
-                else:
-                    # Look for word boundary
-                    word_end = self._find_word_boundary(text, max(0, end - 50), end)
-                    if word_end > start:
-                        end = word_end
+            # The batch that reaches the end of the text is the last one
+            if batch_end >= total_length:
+                break
             
-            # Extract chunk
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+            # Prevent infinite loop when a batch is no longer than the overlap
+            next_start = batch_end - overlap
+            start = next_start if next_start > start else batch_end
+        return ranges
+    
+    def _chunk_batches_parallel(self, text: str, batch_ranges: List[Tuple[int, int]],
+                                chunk_size: int, overlap: int) -> List[List[str]]:
+        """Chunk batches across a process pool, returning the chunks of each batch in order."""
+        workers = min(os.cpu_count() or 1, len(batch_ranges))
+        # Workers only receive their own batch slice, never the whole text
+        batch_texts = (text[start:end] for start, end in batch_ranges)
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_chunk_text_range, batch_texts,
+                                   [chunk_size] * len(batch_ranges), [overlap] * len(batch_ranges),
+                                   chunksize=max(1, len(batch_ranges) // (workers * 4)))
+            return list(results)
+    
+    @classmethod
+    def _chunk_text_batch(cls, text: str, chunk_size: int, overlap: int,
+                          range_start: int = 0, range_end: Optional[int] = None) -> Iterator[str]:
+        """
+        Chunk a batch of text, given as an offset range into the full text
+        
+        Args:
+            text: Full text being chunked
+            chunk_size: Chunk size
+            overlap: Overlap size
+            range_start: Offset where the batch starts
+            range_end: Offset where the batch ends (default: end of text)
             
-            # Move to next chunk with overlap
-            start = end - overlap
-            if start >= end:
-                start = end
+        Returns:
+            Iterator over chunks
+        """
+        if range_end is None:
+            range_end = len(text)
         
-        return chunks
+        # Cut points come from the same bounded rfind probes as chunk_document
+        offsets = []
+        cls._advance_chunk_offsets(text, range_start, range_end, chunk_size, overlap, offsets, final=True)
+        
+        for start, end in offsets:
+            # Extract chunk; the batch end caps the final chunk of the batch
+            chunk = text[start:min(end, range_end)].strip()
+            if chunk:
+                yield chunk
     
     def get_processing_statistics(self) -> Dict[str, Any]:
         """
@@ -879,20 +1644,23 @@ class DocumentProcessor:
         try:
             memory_usage = self.memory_optimizer.get_current_memory_usage()
             
-            # Calculate document memory usage
-            doc_memory_mb = 0.0
+            # Calculate document memory usage from cached chunk sizes
+            doc_memory_bytes = 0
             for doc in self.stored_documents:
-                if hasattr(doc, 'text_content') and doc.text_content:
-                    doc_memory_mb += len(doc.text_content.encode('utf-8')) / (1024 * 1024)
-                if hasattr(doc, 'chunks') and doc.chunks:
-                    for chunk in doc.chunks:
-                        doc_memory_mb += len(chunk.encode('utf-8')) / (1024 * 1024)
+                if doc.text_content:
+                    doc_memory_bytes += self._utf8_size(doc.text_content)
+                if doc.measured_chunk_count != len(doc.chunks):
+                    # Loaded or trimmed documents are measured once, then served from the cache
+                    self._measure_chunks(doc)
+                doc_memory_bytes += doc.chunk_utf8_bytes
+            doc_memory_mb = doc_memory_bytes / (1024 * 1024)
             
             return {
                 'stored_documents': len(self.stored_documents),
                 'current_document_loaded': self.current_document is not None,
                 'total_memory_usage_mb': memory_usage,
                 'document_memory_mb': round(doc_memory_mb, 2),
+                'interned_chunks': len(self._chunk_intern_table),
                 'memory_pressure': self.memory_optimizer.check_memory_pressure(),
                 'max_documents_in_memory': self.max_documents_in_memory,
                 'chunk_batch_size': self.chunk_processing_batch_size
@@ -906,22 +1674,31 @@ class DocumentProcessor:
         """Optimize document storage for memory efficiency"""
         self.logger.info("Optimizing document storage")
         
-        # Remove excess documents from memory
-        while len(self.stored_documents) > self.max_documents_in_memory:
-            # Remove oldest document (simple strategy)
-            oldest_doc = min(
-                self.stored_documents,
-                key=lambda d: getattr(d, 'upload_date', datetime.min)
-            )
-            
+        # Remove excess documents from memory, oldest first (simple strategy)
+        loaded_docs = [doc for doc in self.stored_documents if doc.chunks or doc.text_content]
+        excess = len(loaded_docs) - self.max_documents_in_memory
+        oldest_docs = heapq.nsmallest(
+            excess,
+            loaded_docs,
+            key=lambda d: getattr(d, 'upload_date', datetime.min)
+        ) if excess > 0 else []
+        
+        for oldest_doc in oldest_docs:
             # Clear content but keep metadata
             if hasattr(oldest_doc, 'text_content'):
                 oldest_doc.text_content = None
             if hasattr(oldest_doc, 'chunks'):
                 oldest_doc.chunks = []
+            oldest_doc.inverted_index = {}
+            oldest_doc.chunk_utf8_bytes = 0
+            oldest_doc.measured_chunk_count = 0
             
             self.logger.info(f"Optimized storage for document: {oldest_doc.filename}")
         
+        if oldest_docs:
+            self._rebuild_chunk_intern_table()
+        self._invalidate_summaries()
+        
         # Force garbage collection
         self.memory_optimizer.force_garbage_collection()
     
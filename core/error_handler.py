@@ -8,16 +8,25 @@ This module provides:
 - Error logging and reporting
 """
 
+import atexit
+import functools
 import logging
-import traceback
+import queue
+import sys
 import tkinter as tk
+from logging.handlers import QueueHandler, QueueListener
 from tkinter import ttk, messagebox
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Deque
+from collections import deque
 from enum import Enum
 from datetime import datetime
 from dataclasses import dataclass
 import threading
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a regular instance dict
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class ErrorSeverity(Enum):
@@ -41,7 +50,99 @@ class ErrorCategory(Enum):
     DEPENDENCY = "dependency"
 
 
-@dataclass
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves all formatting, tracebacks included, to the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _PropagatingHandler(logging.Handler):
+    """Hand queued records to a logger's ancestors, as normal propagation would"""
+    
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self.target = logger.parent
+    
+    def emit(self, record: logging.LogRecord):
+        self.target.callHandlers(record)
+
+
+# Log records go through a queue and are written by a listener thread, so the Tk thread
+# never blocks on formatting or handler I/O. The pipeline is shared by every ErrorHandler
+# and reference counted: the first start() installs it and the last stop() removes it.
+# The listener thread is a daemon, so an exit hook removes the pipeline if any is left.
+_log_pipeline_lock = threading.Lock()
+_log_pipeline_refs = 0
+_log_pipeline_epoch = 0  # counts installs, so a reference taken before an exit teardown is not released twice
+_log_pipeline_logger: Optional[logging.Logger] = None
+_log_queue_handler: Optional[_DeferredQueueHandler] = None
+_log_listener: Optional[QueueListener] = None
+_log_saved_propagate = True
+
+
+def _acquire_log_pipeline(logger: logging.Logger) -> int:
+    """
+    Install the queued log pipeline on the logger, or add a reference to the running one
+    
+    Returns:
+        Epoch of the pipeline the reference belongs to, for _release_log_pipeline
+    """
+    global _log_pipeline_refs, _log_pipeline_epoch, _log_pipeline_logger
+    global _log_queue_handler, _log_listener, _log_saved_propagate
+    with _log_pipeline_lock:
+        _log_pipeline_refs += 1
+        if _log_pipeline_refs > 1:
+            return _log_pipeline_epoch
+        
+        _log_pipeline_epoch += 1
+        _log_pipeline_logger = logger
+        log_queue = queue.SimpleQueue()
+        _log_queue_handler = _DeferredQueueHandler(log_queue)
+        _log_listener = QueueListener(log_queue, _PropagatingHandler(logger), respect_handler_level=True)
+        _log_saved_propagate = logger.propagate
+        logger.addHandler(_log_queue_handler)
+        logger.propagate = False
+        _log_listener.start()
+        return _log_pipeline_epoch
+
+
+def _release_log_pipeline(epoch: int):
+    """Drop a reference to the log pipeline, removing it and writing out queued records on the last one"""
+    global _log_pipeline_refs
+    with _log_pipeline_lock:
+        if _log_pipeline_refs == 0 or epoch != _log_pipeline_epoch:
+            return  # that pipeline was already removed at exit
+        _log_pipeline_refs -= 1
+        if _log_pipeline_refs == 0:
+            _remove_log_pipeline()
+
+
+def _remove_log_pipeline():
+    """Restore the logger and stop the listener once its queue is written out (lock held)"""
+    global _log_pipeline_logger, _log_queue_handler, _log_listener
+    _log_pipeline_logger.removeHandler(_log_queue_handler)
+    _log_pipeline_logger.propagate = _log_saved_propagate
+    _log_listener.stop()
+    _log_pipeline_logger = None
+    _log_listener = None
+    _log_queue_handler = None
+
+
+def _stop_log_pipeline_at_exit():
+    """Write out records still queued at interpreter exit, whatever handlers are left running"""
+    global _log_pipeline_refs
+    with _log_pipeline_lock:
+        if _log_pipeline_refs == 0:
+            return
+        _log_pipeline_refs = 0
+        _remove_log_pipeline()
+
+
+atexit.register(_stop_log_pipeline_at_exit)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ErrorInfo:
     """Error information container"""
     category: ErrorCategory
@@ -53,40 +154,53 @@ class ErrorInfo:
     context: Optional[Dict[str, Any]] = None
 
 
+def _query_widget_geometry(widget: tk.Widget) -> tuple:
+    """Return (toplevel, root x, root y, width, height) for a widget straight from Tk"""
+    return (widget.winfo_toplevel(), widget.winfo_rootx(), widget.winfo_rooty(),
+            widget.winfo_width(), widget.winfo_height())
+
+
 class ProgressIndicator:
     """Progress indicator for long-running operations"""
     
-    def __init__(self, parent: tk.Widget, title: str = "Processing..."):
+    TICK_INTERVAL_MS = 33  # indeterminate animation frame interval (~30 fps)
+    
+    def __init__(self, parent: tk.Widget, title: str = "Processing...",
+                 executor: Optional[Executor] = None,
+                 parent_geometry: Optional[Callable[[], Optional[tuple]]] = None):
         self.parent = parent
         self.title = title
+        self.executor = executor
+        self.parent_geometry = parent_geometry  # returns cached (toplevel, x, y, width, height) or None
         self.progress_window = None
         self.progress_bar = None
         self.status_label = None
         self.cancel_callback = None
         self.is_cancelled = False
+        self._tick_id = None
+        self._ui_thread = None
+        self._pending_updates = queue.SimpleQueue()  # updates posted by worker threads
         
     def show(self, message: str = "Please wait...", indeterminate: bool = True):
         """Show progress indicator"""
         try:
-            # Create progress window
-            self.progress_window = tk.Toplevel(self.parent)
-            self.progress_window.title(self.title)
-            self.progress_window.geometry("400x150")
-            self.progress_window.resizable(False, False)
+            self._ui_thread = threading.get_ident()
             
-            # Center the window
-            self.progress_window.transient(self.parent.winfo_toplevel())
-            self.progress_window.grab_set()
-            
-            # Center on parent
-            parent_x = self.parent.winfo_rootx()
-            parent_y = self.parent.winfo_rooty()
-            parent_width = self.parent.winfo_width()
-            parent_height = self.parent.winfo_height()
+            # Parent placement, from the cache when available so no winfo queries are needed
+            geometry = self.parent_geometry() if self.parent_geometry else None
+            if geometry is None:
+                geometry = _query_widget_geometry(self.parent)
+            toplevel, parent_x, parent_y, parent_width, parent_height = geometry
             
+            # Create progress window, centered on parent
             x = parent_x + (parent_width // 2) - 200
             y = parent_y + (parent_height // 2) - 75
+            self.progress_window = tk.Toplevel(self.parent)
+            self.progress_window.title(self.title)
             self.progress_window.geometry(f"400x150+{x}+{y}")
+            self.progress_window.resizable(False, False)
+            self.progress_window.transient(toplevel)
+            self.progress_window.grab_set()
             
             # Main frame
             main_frame = ttk.Frame(self.progress_window)
@@ -108,7 +222,7 @@ class ProgressIndicator:
                     mode='indeterminate',
                     length=350
                 )
-                self.progress_bar.start(10)
+                self._tick_id = self.progress_window.after(self.TICK_INTERVAL_MS, self._step)
             else:
                 self.progress_bar = ttk.Progressbar(
                     main_frame,
@@ -130,30 +244,92 @@ class ProgressIndicator:
             )
             cancel_button.pack()
             
-            # Update display
-            self.progress_window.update()
+            # Redraw without dispatching pending user events
+            self.progress_window.update_idletasks()
             
         except Exception as e:
             logging.error(f"Error showing progress indicator: {e}")
     
     def update_message(self, message: str):
-        """Update progress message"""
+        """Update progress message (safe to call from a worker thread)"""
+        if self._post_to_ui_thread(self.update_message, message):
+            return
         try:
             if self.status_label and self.progress_window:
                 self.status_label.configure(text=message)
-                self.progress_window.update()
+                self.progress_window.update_idletasks()
         except Exception:
             pass
     
     def update_progress(self, value: int):
-        """Update progress bar value (for determinate mode)"""
+        """Update progress bar value (for determinate mode; safe to call from a worker thread)"""
+        if self._post_to_ui_thread(self.update_progress, value):
+            return
         try:
             if self.progress_bar and self.progress_window:
                 self.progress_bar['value'] = value
-                self.progress_window.update()
+                self.progress_window.update_idletasks()
         except Exception:
             pass
     
+    def _post_to_ui_thread(self, func: Callable, *args) -> bool:
+        """Queue func for the Tk thread when called from another thread; returns True if queued"""
+        if self._ui_thread is None or threading.get_ident() == self._ui_thread:
+            return False
+        # Tk is only touched from its own thread; the queue is drained by run() and the animation tick
+        self._pending_updates.put((func, args))
+        return True
+    
+    def _apply_pending_updates(self):
+        """Apply updates queued by worker threads (Tk thread only)"""
+        while True:
+            try:
+                func, args = self._pending_updates.get_nowait()
+            except queue.Empty:
+                return
+            func(*args)
+    
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func on a worker thread while the progress window keeps animating
+        
+        Args:
+            func: Function to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Result of func; its exception is re-raised on the calling thread
+        """
+        if self.executor is None or self.progress_window is None:
+            return func(*args, **kwargs)
+        
+        # Wait in a nested event loop so the window stays responsive, polling the
+        # worker from the Tk thread so no Tk call is ever made off it
+        done = tk.BooleanVar(master=self.parent, value=False)
+        future = self.executor.submit(func, *args, **kwargs)
+        
+        def poll():
+            self._apply_pending_updates()
+            if future.done():
+                done.set(True)
+            else:
+                self.parent.after(self.TICK_INTERVAL_MS, poll)
+        
+        self.parent.after(self.TICK_INTERVAL_MS, poll)
+        self.parent.wait_variable(done)
+        return future.result()
+    
+    def _step(self):
+        """Advance the indeterminate animation by one frame"""
+        try:
+            self._apply_pending_updates()
+            if self.progress_bar and self.progress_window:
+                self.progress_bar.step(3)
+                self._tick_id = self.progress_window.after(self.TICK_INTERVAL_MS, self._step)
+        except Exception:
+            self._tick_id = None
+    
     def set_cancel_callback(self, callback: Callable):
         """Set callback for cancel button"""
         self.cancel_callback = callback
@@ -169,6 +345,9 @@ class ProgressIndicator:
         """Hide progress indicator"""
         try:
             if self.progress_window:
+                if self._tick_id is not None:
+                    self.progress_window.after_cancel(self._tick_id)
+                    self._tick_id = None
                 self.progress_window.destroy()
                 self.progress_window = None
         except Exception:
@@ -182,11 +361,71 @@ class ProgressIndicator:
 class ErrorHandler:
     """Centralized error handling system"""
     
+    # User message rules per category: (keywords, message) pairs matched in order
+    # against the lowercased error text, falling back to the category default
+    _MESSAGE_RULES = {
+        ErrorCategory.AI_MODEL: (
+            (("model", "transformers"), "The AI model encountered an issue. The application will continue in basic mode."),
+            (("memory", "cuda"), "Insufficient memory for AI processing. Try closing other applications."),
+        ),
+        ErrorCategory.DOCUMENT: (
+            (("pdf",), "Unable to process the PDF file. The file may be corrupted or password-protected."),
+            (("docx", "doc"), "Unable to process the Word document. Please check the file format."),
+            (("size",), "The document is too large to process. Please try a smaller file."),
+        ),
+        ErrorCategory.FILE_IO: (
+            (("permission",), "Permission denied. Please check file access permissions."),
+            (("not found",), "File not found. The file may have been moved or deleted."),
+            (("space",), "Insufficient disk space. Please free up some space and try again."),
+        ),
+    }
+    _DEFAULT_MESSAGES = {
+        ErrorCategory.AI_MODEL: "An AI processing error occurred. Switching to basic mode.",
+        ErrorCategory.DOCUMENT: "Document processing failed. Please try a different file.",
+        ErrorCategory.FILE_IO: "File operation failed. Please check file permissions and try again.",
+        ErrorCategory.MEMORY: "The application is running low on memory. Please close other applications and try again.",
+        ErrorCategory.DEPENDENCY: "A required component is missing. Please check the installation.",
+        ErrorCategory.GAME: "A game error occurred. The game will be reset.",
+    }
+    # Extra recovery suggestion for the first matching keyword rule
+    _RECOVERY_RULES = (
+        (("permission",), "Run the application as administrator"),
+        (("network", "connection"), "Check your internet connection"),
+        (("memory",), "Close other applications to free memory"),
+        (("disk", "space"), "Free up disk space"),
+    )
+    
     def __init__(self, parent_widget: Optional[tk.Widget] = None):
         self.parent_widget = parent_widget
         self.logger = logging.getLogger(__name__)
-        self.error_history: List[ErrorInfo] = []
         self.max_history = 100
+        self.error_history: Deque[ErrorInfo] = deque(maxlen=self.max_history)  # oldest entries drop off in place
+        
+        # Repeats of the same error within a short window are counted and reported once.
+        # Each key's window runs from its own first occurrence; keys are kept in that order.
+        self.coalesce_window_seconds = 0.25
+        self._recent_errors: Dict[tuple, List[Any]] = {}  # key -> [repeat count, first ErrorInfo, first seen]
+        self._recent_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Error dialog, built on first use and reused for later errors
+        self._error_dialog: Optional[tk.Toplevel] = None
+        self._dialog_error_info: Optional[ErrorInfo] = None
+        
+        # Parent placement for progress windows, refreshed whenever the parent's toplevel
+        # is moved or resized instead of being queried from Tk on every show()
+        self._parent_geometry: Optional[tuple] = None
+        self._parent_toplevel: Optional[tk.Misc] = None
+        if parent_widget is not None:
+            self._parent_toplevel = parent_widget.winfo_toplevel()
+            self._parent_toplevel.bind("<Configure>", self._refresh_parent_geometry, add="+")
+        
+        # Epoch of the shared queued log pipeline this handler holds a reference to, if any
+        self._log_pipeline_epoch: Optional[int] = None
+        
+        # Workers for operations run behind a progress indicator (threads start on first submit)
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ProgressWorker")
+        self.start()
         
         # Error message templates
         self.error_templates = {
@@ -254,6 +493,47 @@ class ErrorHandler:
                 ]
             }
         }
+        
+        # Flattened, immutable views of the templates for the error path; the
+        # template lists themselves are never handed out, so they cannot be mutated
+        self._recovery_by_category: Dict[ErrorCategory, tuple] = {
+            category: tuple(template["default_recovery"]) for category, template in self.error_templates.items()
+        }
+        self._title_icon_by_category: Dict[ErrorCategory, tuple] = {
+            category: (template["title"], template["icon"]) for category, template in self.error_templates.items()
+        }
+        
+        # Severity -> (logger method, whether to attach the traceback), resolved once
+        self._log_by_severity: Dict[ErrorSeverity, tuple] = {
+            ErrorSeverity.CRITICAL: (self.logger.critical, True),
+            ErrorSeverity.ERROR: (self.logger.error, True),
+            ErrorSeverity.WARNING: (self.logger.warning, False),
+            ErrorSeverity.INFO: (self.logger.info, False),
+        }
+    
+    def start(self):
+        """Start routing this module's log records through the shared background listener"""
+        if self._log_pipeline_epoch is not None:
+            return
+        self._log_pipeline_epoch = _acquire_log_pipeline(self.logger)
+    
+    def stop(self):
+        """
+        Release the shared background log listener
+        
+        The listener keeps running for other error handlers; the last one to stop
+        writes out any queued records and restores normal propagation.
+        """
+        self._flush_coalesced()
+        if self._log_pipeline_epoch is None:
+            return
+        epoch, self._log_pipeline_epoch = self._log_pipeline_epoch, None
+        _release_log_pipeline(epoch)
+    
+    def shutdown(self):
+        """Release background resources held by the error handler"""
+        self.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
     
     def handle_error(self, 
                     error: Exception, 
@@ -278,17 +558,40 @@ class ErrorHandler:
         Returns:
             ErrorInfo object with error details
         """
+        # The exception text is rendered once and shared by the key, message and suggestions
+        error_str = str(error)
+        error_lower = error_str.lower()
+        
+        # Count repeats of an error already reported in this window instead of reporting them again.
+        # A dialog request is always shown, and a different message or context is a different report.
+        error_key = None
+        if not (show_dialog and self.parent_widget):
+            context_key = repr(context) if context else None
+            error_key = (category, severity, type(error), error_str[:80],
+                         custom_message, tuple(custom_recovery or ()), context_key)
+            with self._recent_lock:
+                recent = self._recent_errors.get(error_key)
+                if recent is not None:
+                    recent[0] += 1
+                    return recent[1]
+        
         # Create error info
         error_info = ErrorInfo(
             category=category,
             severity=severity,
-            message=custom_message or self._generate_user_message(error, category),
-            technical_details=str(error),
-            recovery_suggestions=custom_recovery or self._get_recovery_suggestions(category, error),
+            message=custom_message or self._generate_user_message(error, category, error_str, error_lower),
+            technical_details=error_str,
+            recovery_suggestions=custom_recovery or self._get_recovery_suggestions(category, error, error_str, error_lower),
             timestamp=datetime.now(),
             context=context
         )
         
+        if error_key is not None:
+            with self._recent_lock:
+                self._recent_errors[error_key] = [0, error_info, time.monotonic()]
+                if self._flush_timer is None:
+                    self._schedule_flush(self.coalesce_window_seconds)
+        
         # Log the error
         self._log_error(error_info, error)
         
@@ -301,6 +604,53 @@ class ErrorHandler:
         
         return error_info
     
+    def _schedule_flush(self, delay: float):
+        """Start the timer that closes the oldest coalescing window (_recent_lock held)"""
+        self._flush_timer = threading.Timer(delay, self._flush_coalesced, kwargs={"expired_only": True})
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _flush_coalesced(self, expired_only: bool = False):
+        """
+        Close coalescing windows, logging one aggregated record per repeated error
+        
+        Args:
+            expired_only: Only close windows that have run their full length
+        """
+        now = time.monotonic()
+        with self._recent_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            # Windows close in the order they opened, so the expired ones lead the dict
+            closed = []
+            for key, entry in self._recent_errors.items():
+                if expired_only and now - entry[2] < self.coalesce_window_seconds:
+                    break
+                closed.append(key)
+            closed_entries = [self._recent_errors.pop(key) for key in closed]
+            
+            if self._recent_errors:
+                oldest = next(iter(self._recent_errors.values()))
+                self._schedule_flush(max(0.0, oldest[2] + self.coalesce_window_seconds - now))
+        
+        for repeats, first_info, _ in closed_entries:
+            if not repeats:
+                continue
+            
+            repeated_info = ErrorInfo(
+                category=first_info.category,
+                severity=first_info.severity,
+                message=f"{first_info.message} (repeated {repeats} more times since {first_info.timestamp:%H:%M:%S})",
+                technical_details=first_info.technical_details,
+                recovery_suggestions=first_info.recovery_suggestions,
+                timestamp=datetime.now(),
+                context=first_info.context
+            )
+            self._log_error(repeated_info)
+            self._add_to_history(repeated_info)
+    
     def handle_warning(self,
                       message: str,
                       category: ErrorCategory = ErrorCategory.SYSTEM,
@@ -325,206 +675,199 @@ class ErrorHandler:
         
         return error_info
     
-    def _generate_user_message(self, error: Exception, category: ErrorCategory) -> str:
+    def _generate_user_message(self, error: Exception, category: ErrorCategory,
+                               error_text: Optional[str] = None, error_lower: Optional[str] = None) -> str:
         """Generate user-friendly error message"""
-        error_str = str(error).lower()
-        
-        # AI Model specific errors
-        if category == ErrorCategory.AI_MODEL:
-            if "model" in error_str or "transformers" in error_str:
-                return "The AI model encountered an issue. The application will continue in basic mode."
-            elif "memory" in error_str or "cuda" in error_str:
-                return "Insufficient memory for AI processing. Try closing other applications."
-            else:
-                return "An AI processing error occurred. Switching to basic mode."
-        
-        # Document specific errors
-        elif category == ErrorCategory.DOCUMENT:
-            if "pdf" in error_str:
-                return "Unable to process the PDF file. The file may be corrupted or password-protected."
-            elif "docx" in error_str or "doc" in error_str:
-                return "Unable to process the Word document. Please check the file format."
-            elif "size" in error_str:
-                return "The document is too large to process. Please try a smaller file."
-            else:
-                return "Document processing failed. Please try a different file."
-        
-        # File I/O errors
-        elif category == ErrorCategory.FILE_IO:
-            if "permission" in error_str:
-                return "Permission denied. Please check file access permissions."
-            elif "not found" in error_str:
-                return "File not found. The file may have been moved or deleted."
-            elif "space" in error_str:
-                return "Insufficient disk space. Please free up some space and try again."
-            else:
-                return "File operation failed. Please check file permissions and try again."
-        
-        # Memory errors
-        elif category == ErrorCategory.MEMORY:
-            return "The application is running low on memory. Please close other applications and try again."
+        if error_text is None:
+            error_text = str(error)
         
-        # Dependency errors
-        elif category == ErrorCategory.DEPENDENCY:
-            return "A required component is missing. Please check the installation."
+        # Only the rules of the error's own category are checked
+        rules = self._MESSAGE_RULES.get(category)
+        if rules:
+            error_str = error_text.lower() if error_lower is None else error_lower
+            for keywords, message in rules:
+                if any(keyword in error_str for keyword in keywords):
+                    return message
         
-        # Game errors
-        elif category == ErrorCategory.GAME:
-            return "A game error occurred. The game will be reset."
+        default_message = self._DEFAULT_MESSAGES.get(category)
+        if default_message is not None:
+            return default_message
         
         # Default system error
-        else:
-            return f"An unexpected error occurred: {str(error)[:100]}..."
+        return f"An unexpected error occurred: {error_text[:100]}..."
     
-    def _get_recovery_suggestions(self, category: ErrorCategory, error: Exception) -> List[str]:
+    def _get_recovery_suggestions(self, category: ErrorCategory, error: Exception,
+                                  error_text: Optional[str] = None, error_lower: Optional[str] = None) -> List[str]:
         """Get recovery suggestions for error category"""
-        suggestions = self.error_templates.get(category, {}).get("default_recovery", [])
+        default_suggestions = self._recovery_by_category.get(category, ())
         
         # Add specific suggestions based on error content
-        error_str = str(error).lower()
+        if error_lower is None:
+            error_lower = (str(error) if error_text is None else error_text).lower()
         
-        if "permission" in error_str:
-            suggestions.insert(0, "Run the application as administrator")
-        elif "network" in error_str or "connection" in error_str:
-            suggestions.insert(0, "Check your internet connection")
-        elif "memory" in error_str:
-            suggestions.insert(0, "Close other applications to free memory")
-        elif "disk" in error_str or "space" in error_str:
-            suggestions.insert(0, "Free up disk space")
+        for keywords, suggestion in self._RECOVERY_RULES:
+            if any(keyword in error_lower for keyword in keywords):
+                return [suggestion, *default_suggestions][:5]  # Limit to 5 suggestions
         
-        return suggestions[:5]  # Limit to 5 suggestions
+        return list(default_suggestions[:5])
     
     def _log_error(self, error_info: ErrorInfo, exception: Optional[Exception] = None):
         """Log error to logging system"""
-        log_message = f"[{error_info.category.value}] {error_info.message}"
-        
+        # Message, context and traceback are passed unformatted; they are only formatted
+        # on the listener thread, and only if a handler accepts the record
         if error_info.context:
-            log_message += f" | Context: {error_info.context}"
-        
-        if error_info.severity == ErrorSeverity.CRITICAL:
-            self.logger.critical(log_message)
-            if exception:
-                self.logger.critical(traceback.format_exc())
-        elif error_info.severity == ErrorSeverity.ERROR:
-            self.logger.error(log_message)
-            if exception:
-                self.logger.error(traceback.format_exc())
-        elif error_info.severity == ErrorSeverity.WARNING:
-            self.logger.warning(log_message)
+            log_args = ("[%s] %s | Context: %s", error_info.category.value, error_info.message, error_info.context)
         else:
-            self.logger.info(log_message)
+            log_args = ("[%s] %s", error_info.category.value, error_info.message)
+        
+        log, with_traceback = self._log_by_severity[error_info.severity]
+        log(*log_args, exc_info=exception if with_traceback else None)
     
     def _add_to_history(self, error_info: ErrorInfo):
         """Add error to history"""
         self.error_history.append(error_info)
-        
-        # Trim history if too long
-        if len(self.error_history) > self.max_history:
-            self.error_history = self.error_history[-self.max_history:]
     
     def _show_error_dialog(self, error_info: ErrorInfo):
         """Show error dialog to user"""
         try:
-            template = self.error_templates.get(error_info.category, self.error_templates[ErrorCategory.SYSTEM])
-            
-            # Create error dialog
-            dialog = tk.Toplevel(self.parent_widget)
-            dialog.title(template["title"])
-            dialog.geometry("500x400")
-            dialog.resizable(False, False)
-            
-            # Center dialog
-            dialog.transient(self.parent_widget.winfo_toplevel())
-            dialog.grab_set()
-            
-            # Main frame
-            main_frame = ttk.Frame(dialog)
-            main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-            
-            # Error icon and title
-            header_frame = ttk.Frame(main_frame)
-            header_frame.pack(fill=tk.X, pady=(0, 15))
-            
-            icon_label = ttk.Label(
-                header_frame,
-                text=template["icon"],
-                font=("Arial", 24)
-            )
-            icon_label.pack(side=tk.LEFT, padx=(0, 10))
-            
-            title_label = ttk.Label(
-                header_frame,
-                text=template["title"],
-                font=("Arial", 14, "bold"),
-                foreground="#d13438"
+            title, icon = self._title_icon_by_category.get(
+                error_info.category, self._title_icon_by_category[ErrorCategory.SYSTEM]
             )
-            title_label.pack(side=tk.LEFT, anchor=tk.W)
             
-            # Error message
-            message_frame = ttk.LabelFrame(main_frame, text="What happened?", padding=10)
-            message_frame.pack(fill=tk.X, pady=(0, 15))
+            # The dialog is built once and reused; it is only rebuilt if Tk destroyed it
+            if self._error_dialog is None or not self._error_dialog.winfo_exists():
+                self._build_error_dialog()
             
-            message_label = ttk.Label(
-                message_frame,
-                text=error_info.message,
-                font=("Arial", 10),
-                wraplength=450,
-                justify=tk.LEFT
-            )
-            message_label.pack(anchor=tk.W)
+            dialog = self._error_dialog
+            self._dialog_error_info = error_info
+            dialog.title(title)
+            self._dialog_icon_label.configure(text=icon)
+            self._dialog_title_label.configure(text=title)
+            self._dialog_message_label.configure(text=error_info.message)
             
             # Recovery suggestions
+            self._dialog_recovery_frame.pack_forget()
             if error_info.recovery_suggestions:
-                recovery_frame = ttk.LabelFrame(main_frame, text="What can you do?", padding=10)
-                recovery_frame.pack(fill=tk.X, pady=(0, 15))
-                
-                for i, suggestion in enumerate(error_info.recovery_suggestions, 1):
-                    suggestion_label = ttk.Label(
-                        recovery_frame,
-                        text=f"{i}. {suggestion}",
-                        font=("Arial", 10),
-                        wraplength=450,
-                        justify=tk.LEFT
-                    )
-                    suggestion_label.pack(anchor=tk.W, pady=2)
+                self._dialog_recovery_frame.pack(fill=tk.X, pady=(0, 15))
+                suggestions = error_info.recovery_suggestions[:len(self._dialog_suggestion_labels)]
+                for i, suggestion_label in enumerate(self._dialog_suggestion_labels):
+                    if i < len(suggestions):
+                        suggestion_label.configure(text=f"{i + 1}. {suggestions[i]}")
+                        suggestion_label.pack(anchor=tk.W, pady=2)
+                    else:
+                        suggestion_label.pack_forget()
             
-            # Technical details (collapsible)
+            # Technical details
+            self._dialog_details_frame.pack_forget()
             if error_info.technical_details:
-                details_frame = ttk.LabelFrame(main_frame, text="Technical Details", padding=10)
-                details_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-                
-                details_text = tk.Text(
-                    details_frame,
-                    height=4,
-                    wrap=tk.WORD,
-                    font=("Courier", 9),
-                    bg="#f8f9fa",
-                    fg="#333333"
-                )
-                details_text.pack(fill=tk.BOTH, expand=True)
+                self._dialog_details_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+                details_text = self._dialog_details_text
+                details_text.configure(state=tk.NORMAL)
+                details_text.delete("1.0", tk.END)
                 details_text.insert(tk.END, error_info.technical_details)
                 details_text.configure(state=tk.DISABLED)
             
-            # Buttons
-            button_frame = ttk.Frame(main_frame)
-            button_frame.pack(side=tk.BOTTOM)
-            
-            ttk.Button(
-                button_frame,
-                text="OK",
-                command=dialog.destroy
-            ).pack(side=tk.RIGHT, padx=5)
-            
-            ttk.Button(
-                button_frame,
-                text="Copy Details",
-                command=lambda: self._copy_error_details(error_info)
-            ).pack(side=tk.RIGHT, padx=5)
+            dialog.deiconify()
+            dialog.lift()
+            dialog.grab_set()
             
         except Exception as e:
             # Fallback to simple messagebox if dialog creation fails
             messagebox.showerror("Error", error_info.message)
     
+    def _build_error_dialog(self):
+        """Create the reusable error dialog, initially hidden"""
+        dialog = tk.Toplevel(self.parent_widget)
+        dialog.withdraw()
+        dialog.geometry("500x400")
+        dialog.resizable(False, False)
+        dialog.transient(self.parent_widget.winfo_toplevel())
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_error_dialog)
+        
+        # Main frame
+        main_frame = ttk.Frame(dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Buttons (packed first so the optional sections fill the space above them)
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(side=tk.BOTTOM)
+        
+        ttk.Button(
+            button_frame,
+            text="OK",
+            command=self._hide_error_dialog
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        ttk.Button(
+            button_frame,
+            text="Copy Details",
+            command=lambda: self._copy_error_details(self._dialog_error_info)
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        # Error icon and title
+        header_frame = ttk.Frame(main_frame)
+        header_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        self._dialog_icon_label = ttk.Label(
+            header_frame,
+            font=("Arial", 24)
+        )
+        self._dialog_icon_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self._dialog_title_label = ttk.Label(
+            header_frame,
+            font=("Arial", 14, "bold"),
+            foreground="#d13438"
+        )
+        self._dialog_title_label.pack(side=tk.LEFT, anchor=tk.W)
+        
+        # Error message
+        message_frame = ttk.LabelFrame(main_frame, text="What happened?", padding=10)
+        message_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        self._dialog_message_label = ttk.Label(
+            message_frame,
+            font=("Arial", 10),
+            wraplength=450,
+            justify=tk.LEFT
+        )
+        self._dialog_message_label.pack(anchor=tk.W)
+        
+        # Recovery suggestions (at most five are ever shown)
+        self._dialog_recovery_frame = ttk.LabelFrame(main_frame, text="What can you do?", padding=10)
+        self._dialog_suggestion_labels = [
+            ttk.Label(
+                self._dialog_recovery_frame,
+                font=("Arial", 10),
+                wraplength=450,
+                justify=tk.LEFT
+            )
+            for _ in range(5)
+        ]
+        
+        # Technical details
+        self._dialog_details_frame = ttk.LabelFrame(main_frame, text="Technical Details", padding=10)
+        self._dialog_details_text = tk.Text(
+            self._dialog_details_frame,
+            height=4,
+            wrap=tk.WORD,
+            font=("Courier", 9),
+            bg="#f8f9fa",
+            fg="#333333"
+        )
+        self._dialog_details_text.pack(fill=tk.BOTH, expand=True)
+        
+        self._error_dialog = dialog
+    
+    def _hide_error_dialog(self):
+        """Hide the reusable error dialog until the next error"""
+        try:
+            if self._error_dialog is not None:
+                self._error_dialog.grab_release()
+                self._error_dialog.withdraw()
+        except Exception:
+            pass
+    
     def _show_warning_dialog(self, error_info: ErrorInfo):
         """Show warning dialog to user"""
         try:
@@ -538,14 +881,16 @@ class ErrorHandler:
     def _copy_error_details(self, error_info: ErrorInfo):
         """Copy error details to clipboard"""
         try:
-            details = f"Error Category: {error_info.category.value}\n"
-            details += f"Severity: {error_info.severity.value}\n"
-            details += f"Time: {error_info.timestamp}\n"
-            details += f"Message: {error_info.message}\n"
-            details += f"Technical Details: {error_info.technical_details}\n"
-            
-            if error_info.context:
-                details += f"Context: {error_info.context}\n"
+            # Assemble the payload in one pass rather than growing it line by line
+            context_line = f"Context: {error_info.context}\n" if error_info.context else ""
+            details = (
+                f"Error Category: {error_info.category.value}\n"
+                f"Severity: {error_info.severity.value}\n"
+                f"Time: {error_info.timestamp}\n"
+                f"Message: {error_info.message}\n"
+                f"Technical Details: {error_info.technical_details}\n"
+                f"{context_line}"
+            )
             
             # Copy to clipboard
             self.parent_widget.clipboard_clear()
@@ -557,7 +902,7 @@ class ErrorHandler:
     
     def get_error_history(self) -> List[ErrorInfo]:
         """Get error history"""
-        return self.error_history.copy()
+        return list(self.error_history)
     
     def clear_error_history(self):
         """Clear error history"""
@@ -565,7 +910,21 @@ class ErrorHandler:
     
     def create_progress_indicator(self, title: str = "Processing...") -> ProgressIndicator:
         """Create a progress indicator"""
-        return ProgressIndicator(self.parent_widget, title)
+        return ProgressIndicator(self.parent_widget, title, self.executor, self._get_parent_geometry)
+    
+    def _refresh_parent_geometry(self, event=None):
+        """Re-read the parent's placement after its toplevel was moved or resized"""
+        # Toplevel bindings also fire for every child widget's <Configure>
+        if event is not None and event.widget is not self._parent_toplevel:
+            return
+        try:
+            self._parent_geometry = _query_widget_geometry(self.parent_widget)
+        except tk.TclError:
+            self._parent_geometry = None
+    
+    def _get_parent_geometry(self) -> Optional[tuple]:
+        """Get the cached parent placement, or None if it has not been measured yet"""
+        return self._parent_geometry
 
 
 # Decorator for automatic error handling
@@ -583,24 +942,25 @@ def handle_errors(category: ErrorCategory,
         fallback_return: Value to return on error
     """
     def decorator(func):
+        func_name = func.__name__
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                # Try to find error handler in instance
-                error_handler = None
-                if args and hasattr(args[0], 'error_handler'):
-                    error_handler = args[0].error_handler
+                # Try to find error handler in instance; context is only built once an error occurred
+                error_handler = getattr(args[0], 'error_handler', None) if args else None
                 
                 if error_handler:
                     error_handler.handle_error(
                         e, category, severity, 
-                        context={"function": func.__name__, "args": str(args[1:])},
+                        context={"function": func_name, "args": str(args[1:])},
                         show_dialog=show_dialog
                     )
                 else:
                     # Fallback logging
-                    logging.error(f"Error in {func.__name__}: {e}")
+                    logging.error(f"Error in {func_name}: {e}")
                 
                 return fallback_return
         return wrapper
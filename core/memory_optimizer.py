@@ -9,11 +9,14 @@ This module provides memory management optimizations for:
 """
 
 import gc
+import heapq
 import sys
 import weakref
 import threading
 import logging
-from typing import Dict, List, Optional, Any, Callable, Set
+import time
+from typing import Dict, List, Optional, Any, Callable, Deque
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import psutil
@@ -23,10 +26,15 @@ import psutil
 class MemoryPool:
     """Memory pool for reusable objects"""
     name: str
-    objects: List[Any]
+    objects: Deque[Any]  # bounded by max_size; returning to a full pool evicts the oldest object
     max_size: int
     created_count: int = 0
     reused_count: int = 0
+    base_size: int = 0  # configured size that adaptive resizing scales from
+    
+    def __post_init__(self):
+        if not self.base_size:
+            self.base_size = self.max_size
 
 
 class MemoryOptimizer:
@@ -47,15 +55,39 @@ class MemoryOptimizer:
         # Memory pools for object reuse
         self.memory_pools: Dict[str, MemoryPool] = {}
         
-        # Weak references to track large objects
-        self.tracked_objects: Set[weakref.ref] = set()
+        # Weak references to track large objects; entries drop out when the object is collected
+        self.tracked_objects: weakref.WeakSet = weakref.WeakSet()
         
-        # Memory optimization callbacks
+        # Memory optimization callbacks; replaced (never mutated) on registration so
+        # an optimization pass can iterate a consistent snapshot without locking
         self.optimization_callbacks: List[Callable] = []
+        self._callbacks_lock = threading.Lock()
         
         # Memory usage tracking
         self.peak_memory_mb = 0.0
         self.optimization_count = 0
+        self.memory_pressure_ratio = 0.0  # last measured usage / max_memory_mb
+        
+        # Pools shrink under pressure and grow when memory is plentiful, within these bounds
+        self.pool_shrink_ratio = 0.8
+        self.pool_grow_ratio = 0.5
+        self.pool_min_scale = 0.25
+        self.pool_max_scale = 4
+        self.pool_resize_interval_seconds = 1.0  # pressure checks resize pools at most this often
+        self._pool_resize_time = float('-inf')
+        
+        # One process handle, with RSS readings reused for a short time so frequent
+        # pressure checks do not each hit /proc (or reopen the process handle)
+        self._process = psutil.Process()
+        self._rss_ttl_seconds = 0.1
+        self._rss_cache_time = float('-inf')
+        self._rss_cache_mb = 0.0
+        
+        # Proportional set size for pressure decisions; slower to read than RSS, so cached longer
+        self._pss_available = True
+        self._pss_ttl_seconds = 1.0
+        self._pss_cache_time = float('-inf')
+        self._pss_cache_mb = 0.0
         
         # Document memory management
         self.document_cache_limit = 5  # Maximum documents in memory
@@ -72,34 +104,42 @@ class MemoryOptimizer:
         # String pool for document chunks
         self.memory_pools['document_chunks'] = MemoryPool(
             name='document_chunks',
-            objects=[],
+            objects=deque(maxlen=100),
             max_size=100
         )
         
         # List pool for temporary collections
         self.memory_pools['temp_lists'] = MemoryPool(
             name='temp_lists',
-            objects=[],
+            objects=deque(maxlen=50),
             max_size=50
         )
         
         # Dictionary pool for temporary data structures
         self.memory_pools['temp_dicts'] = MemoryPool(
             name='temp_dicts',
-            objects=[],
+            objects=deque(maxlen=50),
             max_size=50
         )
     
-    def get_current_memory_usage(self) -> float:
+    def get_current_memory_usage(self, fresh: bool = False) -> float:
         """
         Get current memory usage in MB
         
+        Args:
+            fresh: Always read the process RSS instead of reusing a reading younger than the TTL
+        
         Returns:
             Current memory usage in MB
         """
         try:
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / (1024 * 1024)
+            now = time.monotonic()
+            if not fresh and now - self._rss_cache_time < self._rss_ttl_seconds:
+                return self._rss_cache_mb
+            
+            memory_mb = self._process.memory_info().rss / (1024 * 1024)
+            self._rss_cache_time = now
+            self._rss_cache_mb = memory_mb
             
             # Update peak memory tracking
             if memory_mb > self.peak_memory_mb:
@@ -110,6 +150,35 @@ class MemoryOptimizer:
             self.logger.error(f"Error getting memory usage: {e}")
             return 0.0
     
+    def get_pressure_memory_usage(self) -> float:
+        """
+        Get memory usage in MB for pressure decisions
+        
+        Uses the proportional set size where the platform reports it (Linux), so pages
+        shared with other processes are not counted in full; falls back to RSS elsewhere.
+        
+        Returns:
+            Memory usage in MB
+        """
+        if not self._pss_available:
+            return self.get_current_memory_usage()
+        
+        now = time.monotonic()
+        if now - self._pss_cache_time < self._pss_ttl_seconds:
+            return self._pss_cache_mb
+        
+        try:
+            pss = self._process.memory_full_info().pss
+        except Exception as e:
+            # No PSS on this platform (or smaps is unreadable); stay on RSS from now on
+            self.logger.debug(f"Proportional memory usage unavailable, using RSS: {e}")
+            self._pss_available = False
+            return self.get_current_memory_usage()
+        
+        self._pss_cache_time = now
+        self._pss_cache_mb = pss / (1024 * 1024)
+        return self._pss_cache_mb
+    
     def check_memory_pressure(self) -> bool:
         """
         Check if system is under memory pressure
@@ -117,8 +186,15 @@ class MemoryOptimizer:
         Returns:
             True if memory pressure is detected
         """
-        current_memory = self.get_current_memory_usage()
+        current_memory = self.get_pressure_memory_usage()
         memory_ratio = current_memory / self.max_memory_mb
+        self.memory_pressure_ratio = memory_ratio
+        
+        # Fit pool capacities to the pressure just measured, at a bounded cadence
+        now = time.monotonic()
+        if now - self._pool_resize_time >= self.pool_resize_interval_seconds:
+            self._pool_resize_time = now
+            self._resize_pools(memory_ratio)
         
         return memory_ratio > 0.8  # 80% threshold
     
@@ -139,31 +215,36 @@ class MemoryOptimizer:
         optimized_count = 0
         
         try:
-            # Sort documents by last access time (if available)
-            sorted_docs = sorted(
+            # Select only the oldest excess documents by last access time (if available)
+            excess = max(0, len(documents) - self.document_cache_limit)
+            victims = heapq.nsmallest(
+                excess,
                 documents,
-                key=lambda d: getattr(d, 'last_accessed', datetime.min),
-                reverse=False  # Oldest first
+                key=lambda d: getattr(d, 'last_accessed', datetime.min)
             )
             
             # Remove excess documents from memory
-            while len(sorted_docs) > self.document_cache_limit:
-                doc = sorted_docs.pop(0)
-                
+            for doc in victims:
                 # Clear document content but keep metadata
                 if hasattr(doc, 'text_content'):
                     doc.text_content = None
                 if hasattr(doc, 'chunks'):
                     doc.chunks = []
+                    self._invalidate_chunk_derived_fields(doc)
                 
                 optimized_count += 1
                 self.logger.debug(f"Optimized document: {getattr(doc, 'filename', 'unknown')}")
             
             # Optimize remaining documents
-            for doc in sorted_docs:
+            victim_ids = {id(doc) for doc in victims}
+            for doc in documents:
+                if id(doc) in victim_ids:
+                    continue
                 if hasattr(doc, 'chunks') and len(doc.chunks) > self.chunk_cache_limit:
-                    # Keep only most relevant chunks
+                    # Keep only most relevant chunks in a new list; the old one may
+                    # still be shared, e.g. by the conversation's document context
                     doc.chunks = doc.chunks[:self.chunk_cache_limit]
+                    self._invalidate_chunk_derived_fields(doc)
                     optimized_count += 1
             
             if optimized_count > 0:
@@ -176,6 +257,16 @@ class MemoryOptimizer:
             self.logger.error(f"Error optimizing document memory: {e}")
             return 0
     
+    @staticmethod
+    def _invalidate_chunk_derived_fields(doc: Any):
+        """Drop a document's chunk index and size cache so its owner rebuilds them for the new chunks"""
+        if hasattr(doc, 'inverted_index'):
+            doc.inverted_index = {}
+            doc.indexed_chunk_count = -1
+        if hasattr(doc, 'measured_chunk_count'):
+            doc.chunk_utf8_bytes = 0
+            doc.measured_chunk_count = -1
+    
     def optimize_ai_model_memory(self, ai_engine: Any) -> bool:
         """
         Optimize AI model memory usage
@@ -190,7 +281,7 @@ class MemoryOptimizer:
             if not hasattr(ai_engine, 'models_loaded') or not ai_engine.models_loaded:
                 return False
             
-            current_memory = self.get_current_memory_usage()
+            current_memory = self.get_pressure_memory_usage()
             
             # If memory usage is high, consider unloading models temporarily
             if current_memory > self.max_memory_mb * 0.9:
@@ -235,18 +326,21 @@ class MemoryOptimizer:
                 # Clear large text widgets if not visible
                 if hasattr(component, 'chat_display'):
                     text_widget = component.chat_display
-                    if hasattr(text_widget, 'get') and hasattr(text_widget, 'delete'):
-                        content_length = len(text_widget.get("1.0", "end"))
+                    if hasattr(text_widget, 'index') and hasattr(text_widget, 'delete'):
+                        # Measure through Tk indices instead of copying the whole buffer into Python
+                        last_line = int(text_widget.index("end-1c").split('.')[0])
                         
                         # If content is very large, trim it
-                        if content_length > 100000:  # 100KB of text
-                            # Keep only recent content
-                            lines = text_widget.get("1.0", "end").split('\n')
-                            if len(lines) > 1000:
-                                # Keep last 500 lines
-                                recent_content = '\n'.join(lines[-500:])
-                                text_widget.delete("1.0", "end")
-                                text_widget.insert("1.0", recent_content)
+                        if last_line >= 1000:
+                            char_count = text_widget.count("1.0", "end", "chars")
+                            if char_count and char_count[0] > 100000:  # 100KB of text
+                                # Keep last 500 lines; Tk drops the head in place, so tags survive
+                                was_disabled = str(text_widget.cget("state")) == "disabled"
+                                if was_disabled:
+                                    text_widget.configure(state="normal")
+                                text_widget.delete("1.0", f"{last_line - 499}.0")
+                                if was_disabled:
+                                    text_widget.configure(state="disabled")
                                 optimized_count += 1
                 
                 # Clear cached images or large data
@@ -275,13 +369,13 @@ class MemoryOptimizer:
         Returns:
             Object from pool or newly created object
         """
-        if pool_name not in self.memory_pools:
+        pool = self.memory_pools.get(pool_name)
+        if pool is None:
             return factory_func() if factory_func else None
         
-        pool = self.memory_pools[pool_name]
-        
-        if pool.objects:
-            obj = pool.objects.pop()
+        objects = pool.objects
+        if objects:
+            obj = objects.pop()
             pool.reused_count += 1
             return obj
         else:
@@ -299,21 +393,59 @@ class MemoryOptimizer:
             pool_name: Name of the memory pool
             obj: Object to return to pool
         """
-        if pool_name not in self.memory_pools:
+        pool = self.memory_pools.get(pool_name)
+        if pool is None:
             return
         
-        pool = self.memory_pools[pool_name]
+        # Clear object state before returning to pool
+        if hasattr(obj, 'clear'):
+            obj.clear()
+        elif isinstance(obj, list):
+            obj.clear()
+        elif isinstance(obj, dict):
+            obj.clear()
+        
+        # The pool is a bounded deque, so a full pool drops its oldest object
+        pool.objects.append(obj)
+    
+    def _resize_pools(self, pressure_ratio: Optional[float] = None, allow_grow: bool = True) -> int:
+        """
+        Scale pool capacities with memory pressure
         
-        if len(pool.objects) < pool.max_size:
-            # Clear object state before returning to pool
-            if hasattr(obj, 'clear'):
-                obj.clear()
-            elif isinstance(obj, list):
-                obj.clear()
-            elif isinstance(obj, dict):
-                obj.clear()
+        Pools are halved while usage is above pool_shrink_ratio of the limit and
+        doubled while it is below pool_grow_ratio, staying between pool_min_scale and
+        pool_max_scale times their configured size.
+        
+        Args:
+            pressure_ratio: Memory usage as a fraction of the limit (measured if omitted)
+            allow_grow: Whether low pressure may grow pools; cleanup passes only shrink them
             
-            pool.objects.append(obj)
+        Returns:
+            Number of pools resized
+        """
+        if pressure_ratio is None:
+            pressure_ratio = self.get_pressure_memory_usage() / self.max_memory_mb
+            self.memory_pressure_ratio = pressure_ratio
+        
+        resized_count = 0
+        for pool in self.memory_pools.values():
+            if pressure_ratio > self.pool_shrink_ratio:
+                new_size = max(pool.max_size // 2, int(pool.base_size * self.pool_min_scale), 1)
+            elif allow_grow and pressure_ratio < self.pool_grow_ratio:
+                new_size = min(pool.max_size * 2, pool.base_size * self.pool_max_scale)
+            else:
+                continue
+            
+            if new_size != pool.max_size:
+                # Rebuilding the deque keeps the most recently returned objects
+                pool.objects = deque(pool.objects, maxlen=new_size)
+                pool.max_size = new_size
+                resized_count += 1
+        
+        if resized_count:
+            self.logger.debug(f"Resized {resized_count} memory pools at {pressure_ratio:.0%} memory usage")
+        
+        return resized_count
     
     def track_large_object(self, obj: Any, size_threshold_mb: float = 10.0):
         """
@@ -324,20 +456,17 @@ class MemoryOptimizer:
             size_threshold_mb: Size threshold in MB for tracking
         """
         try:
-            obj_size_mb = sys.getsizeof(obj) / (1024 * 1024)
+            # Compare raw bytes; the MB figure is only needed for the log line
+            obj_size = sys.getsizeof(obj)
             
-            if obj_size_mb > size_threshold_mb:
-                weak_ref = weakref.ref(obj, self._object_cleanup_callback)
-                self.tracked_objects.add(weak_ref)
+            if obj_size > size_threshold_mb * (1024 * 1024):
+                obj_size_mb = obj_size / (1024 * 1024)
+                self.tracked_objects.add(obj)
                 self.logger.debug(f"Tracking large object: {obj_size_mb:.1f}MB")
         
         except Exception as e:
             self.logger.error(f"Error tracking large object: {e}")
     
-    def _object_cleanup_callback(self, weak_ref):
-        """Callback when tracked object is garbage collected"""
-        self.tracked_objects.discard(weak_ref)
-    
     def force_garbage_collection(self) -> Dict[str, int]:
         """
         Force garbage collection and return statistics
@@ -345,23 +474,21 @@ class MemoryOptimizer:
         Returns:
             Dictionary with garbage collection statistics
         """
-        before_memory = self.get_current_memory_usage()
+        before_memory = self.get_current_memory_usage(fresh=True)
         
-        # Force collection for all generations
-        collected = {}
-        for generation in range(3):
-            collected[f'gen_{generation}'] = gc.collect(generation)
+        # A single full collection also sweeps the younger generations, so
+        # collecting 0 and 1 separately first would only re-scan them
+        collected = gc.collect(2)
         
-        after_memory = self.get_current_memory_usage()
+        after_memory = self.get_current_memory_usage(fresh=True)
         freed_mb = before_memory - after_memory
         
         stats = {
-            'total_collected': sum(collected.values()),
+            'total_collected': collected,
             'memory_freed_mb': round(freed_mb, 2),
             'before_memory_mb': round(before_memory, 2),
             'after_memory_mb': round(after_memory, 2)
         }
-        stats.update(collected)
         
         if freed_mb > 1:  # Log if significant memory was freed
             self.logger.info(f"Garbage collection freed {freed_mb:.1f}MB")
@@ -384,19 +511,21 @@ class MemoryOptimizer:
         try:
             # Use string interning for repeated strings
             interned_strings = []
+            append = interned_strings.append
             seen_strings = {}
+            get_seen = seen_strings.get
+            intern = sys.intern
             
             for s in strings:
-                if s in seen_strings:
-                    interned_strings.append(seen_strings[s])
-                else:
-                    # Intern the string if it's not too large
-                    if len(s) < 1000:
-                        interned_s = sys.intern(s)
-                        seen_strings[s] = interned_s
-                        interned_strings.append(interned_s)
-                    else:
-                        interned_strings.append(s)
+                # Only intern strings that are not too large; large ones are never looked up
+                if len(s) >= 1000:
+                    append(s)
+                    continue
+                
+                interned_s = get_seen(s)
+                if interned_s is None:
+                    interned_s = seen_strings[s] = intern(s)
+                append(interned_s)
             
             return interned_strings
             
@@ -408,6 +537,8 @@ class MemoryOptimizer:
         """
         Get comprehensive memory statistics
         
+        Memory figures are returned unrounded; format them for display at the consumer.
+        
         Returns:
             Dictionary with memory statistics
         """
@@ -415,6 +546,16 @@ class MemoryOptimizer:
             current_memory = self.get_current_memory_usage()
             memory_ratio = current_memory / self.max_memory_mb
             
+            stats = {
+                'current_memory_mb': current_memory,
+                'peak_memory_mb': self.peak_memory_mb,
+                'memory_limit_mb': self.max_memory_mb,
+                'memory_usage_percent': memory_ratio * 100,
+                'optimization_count': self.optimization_count,
+                'tracked_objects': len(self.tracked_objects),
+                'memory_pressure': self.check_memory_pressure()
+            }
+            
             # Pool statistics
             pool_stats = {}
             for name, pool in self.memory_pools.items():
@@ -426,20 +567,12 @@ class MemoryOptimizer:
                     'reuse_ratio': pool.reused_count / max(pool.created_count, 1)
                 }
             
+            stats['memory_pools'] = pool_stats
+            
             # Garbage collection statistics
-            gc_stats = gc.get_stats()
+            stats['gc_stats'] = gc.get_stats()
             
-            return {
-                'current_memory_mb': round(current_memory, 2),
-                'peak_memory_mb': round(self.peak_memory_mb, 2),
-                'memory_limit_mb': self.max_memory_mb,
-                'memory_usage_percent': round(memory_ratio * 100, 1),
-                'optimization_count': self.optimization_count,
-                'tracked_objects': len(self.tracked_objects),
-                'memory_pools': pool_stats,
-                'gc_stats': gc_stats,
-                'memory_pressure': self.check_memory_pressure()
-            }
+            return stats
             
         except Exception as e:
             self.logger.error(f"Error getting memory statistics: {e}")
@@ -452,7 +585,8 @@ class MemoryOptimizer:
         Args:
             callback: Function to call during optimization
         """
-        self.optimization_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.optimization_callbacks = self.optimization_callbacks + [callback]
     
     def perform_comprehensive_optimization(self) -> Dict[str, Any]:
         """
@@ -463,7 +597,7 @@ class MemoryOptimizer:
         """
         self.logger.info("Starting comprehensive memory optimization")
         
-        before_memory = self.get_current_memory_usage()
+        before_memory = self.get_current_memory_usage(fresh=True)
         results = {
             'before_memory_mb': round(before_memory, 2),
             'optimizations_performed': []
@@ -475,20 +609,26 @@ class MemoryOptimizer:
                 pool.objects.clear()
             results['optimizations_performed'].append('cleared_memory_pools')
             
+            # Shrink pool capacities if memory is under pressure; a cleanup pass never grows them
+            if self._resize_pools(allow_grow=False):
+                results['optimizations_performed'].append('resized_memory_pools')
+            
             # Force garbage collection
             gc_stats = self.force_garbage_collection()
             results['gc_stats'] = gc_stats
             results['optimizations_performed'].append('garbage_collection')
             
             # Notify optimization callbacks
+            callbacks_run = 0
             for callback in self.optimization_callbacks:
                 try:
                     callback('comprehensive_optimization')
-                    results['optimizations_performed'].append('callback_optimization')
+                    callbacks_run += 1
                 except Exception as e:
                     self.logger.error(f"Error in optimization callback: {e}")
+            results['optimizations_performed'].extend(['callback_optimization'] * callbacks_run)
             
-            after_memory = self.get_current_memory_usage()
+            after_memory = self.get_current_memory_usage(fresh=True)
             freed_memory = before_memory - after_memory
             
             results.update({
@@ -510,19 +650,22 @@ class MemoryOptimizer:
 
 # Global memory optimizer instance
 _memory_optimizer: Optional[MemoryOptimizer] = None
+_memory_optimizer_lock = threading.Lock()  # guards creation only; reads of the global are lock-free
 
 
 def get_memory_optimizer() -> MemoryOptimizer:
     """Get the global memory optimizer instance"""
-    global _memory_optimizer
-    if _memory_optimizer is None:
-        _memory_optimizer = MemoryOptimizer()
-    return _memory_optimizer
+    return initialize_memory_optimizer()
 
 
 def initialize_memory_optimizer(max_memory_mb: int = 1024) -> MemoryOptimizer:
     """Initialize global memory optimizer"""
     global _memory_optimizer
-    if _memory_optimizer is None:
-        _memory_optimizer = MemoryOptimizer(max_memory_mb)
-    return _memory_optimizer
\ No newline at end of file
+    optimizer = _memory_optimizer
+    if optimizer is None:
+        with _memory_optimizer_lock:
+            # Another thread may have created it while we waited for the lock
+            optimizer = _memory_optimizer
+            if optimizer is None:
+                optimizer = _memory_optimizer = MemoryOptimizer(max_memory_mb)
+    return optimizer
\ No newline at end of file
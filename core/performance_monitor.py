@@ -12,17 +12,32 @@ import os
 import sys
 import psutil
 import gc
+import heapq
 import threading
 import time
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Deque
+from collections import OrderedDict, deque
+from itertools import islice
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Interpreter GC thresholds before any tuning, so repeated tuning never compounds
+_BASE_GC_THRESHOLDS = gc.get_threshold()
+
+# Metrics samples are kept by the thousand, so they use slots where dataclasses support it (3.10+)
+_METRICS_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_METRICS_DATACLASS_OPTIONS)
 class PerformanceMetrics:
     """Performance metrics data structure"""
     timestamp: datetime
@@ -46,6 +61,8 @@ class ResourceLimits:
     max_document_size_mb: int = 50  # Maximum document size
     max_cached_documents: int = 10  # Maximum documents to keep in memory
     gc_frequency_seconds: int = 30  # Garbage collection frequency
+    gc_gen0_threshold_multiplier: int = 10  # Scale of the default generation-0 threshold (1 leaves it alone)
+    manual_gc: bool = False  # Collect only from the monitoring loop while it runs
 
 
 class PerformanceMonitor:
@@ -63,28 +80,43 @@ class PerformanceMonitor:
         self.limits = limits or ResourceLimits()
         self.logger = logging.getLogger(__name__)
         
-        # Performance tracking
-        self.metrics_history: List[PerformanceMetrics] = []
+        # Performance tracking (bounded; the oldest measurements drop off as new ones arrive)
         self.max_history_size = 1000
+        self.metrics_history: Deque[PerformanceMetrics] = deque(maxlen=self.max_history_size)
         
         # Monitoring state
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self._manual_gc_active = False
         self.optimization_callbacks: List[Callable] = []
         
         # Performance counters
-        self.response_times: List[float] = []
+        self.response_times: Deque[float] = deque(maxlen=100)
         self.memory_warnings = 0
         self.optimization_events = 0
         
-        # Cache for expensive operations
-        self.operation_cache: Dict[str, Any] = {}
-        self.cache_timestamps: Dict[str, datetime] = {}
-        self.cache_max_age = timedelta(minutes=10)
+        # Cache for expensive operations: key -> [result, cached_at, hits, size_bytes],
+        # least recently used first; cached_at is a time.monotonic() reading
+        self.operation_cache: OrderedDict = OrderedDict()
+        self.cache_max_age = 600.0  # seconds
+        self.cache_max_entries = 1000
+        # (cached_at, key) min-heap so expiry only visits the oldest entries; items whose
+        # entry has since been re-cached or removed are skipped when popped
+        self._cache_ttl_heap: List[tuple] = []
+        # Running total of the cached results' sizes, kept in step with inserts and removals
+        self._cache_bytes = 0
         
         # Get process handle for monitoring
         self.process = psutil.Process()
         
+        # GC thresholds in effect before start_monitoring() tuned them, restored on stop
+        self._saved_gc_thresholds: Optional[tuple] = None
+        
+        # Last process sample, reused by callers polling faster than the TTL
+        self._sample_ttl_seconds = 0.25
+        self._last_sample: Optional[PerformanceMetrics] = None
+        self._last_sample_time = float('-inf')
+        
         # Don't start monitoring automatically to prevent issues in tests
     
     def start_monitoring(self):
@@ -92,6 +124,9 @@ class PerformanceMonitor:
         if self.monitoring_active:
             return
         
+        # Collect young objects less often; most short-lived allocations die without a gen-0 pass
+        self._tune_gc_thresholds()
+        
         # Don't start monitoring automatically to prevent infinite loops in tests
         # Only start if explicitly requested
         pass
@@ -101,6 +136,7 @@ class PerformanceMonitor:
         self.monitoring_active = False
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5)
+        self._restore_gc_thresholds()
         self.logger.info("Performance monitoring stopped")
     
     def _monitoring_loop(self):
@@ -109,32 +145,43 @@ class PerformanceMonitor:
         loop_count = 0
         max_loops = 1000  # Prevent infinite loops in tests
         
-        while self.monitoring_active and loop_count < max_loops:
-            try:
-                # Collect current metrics
-                metrics = self._collect_metrics()
-                self._add_metrics(metrics)
-                
-                # Check for optimization opportunities
-                self._check_optimization_triggers(metrics)
-                
-                # Periodic garbage collection
-                current_time = time.time()
-                if current_time - last_gc_time > self.limits.gc_frequency_seconds:
-                    self._perform_garbage_collection()
-                    last_gc_time = current_time
-                
-                # Clean old cache entries
-                self._clean_cache()
-                
-                # Sleep before next check
-                time.sleep(5)  # Check every 5 seconds
-                loop_count += 1
-                
-            except Exception as e:
-                self.logger.error(f"Error in performance monitoring: {e}")
-                time.sleep(10)  # Longer sleep on error
-                loop_count += 1
+        # With manual GC, collections run from this loop instead of at arbitrary allocation points;
+        # automatic collection is restored whenever the loop exits
+        self._manual_gc_active = self.limits.manual_gc and gc.isenabled()
+        if self._manual_gc_active:
+            gc.disable()
+        
+        try:
+            while self.monitoring_active and loop_count < max_loops:
+                try:
+                    # Collect current metrics
+                    metrics = self._collect_metrics()
+                    self._add_metrics(metrics)
+                    
+                    # Check for optimization opportunities
+                    self._check_optimization_triggers(metrics)
+                    
+                    # Periodic garbage collection
+                    current_time = time.time()
+                    if current_time - last_gc_time > self.limits.gc_frequency_seconds:
+                        self._perform_garbage_collection()
+                        last_gc_time = current_time
+                    
+                    # Clean old cache entries
+                    self._clean_cache()
+                    
+                    # Sleep before next check
+                    time.sleep(5)  # Check every 5 seconds
+                    loop_count += 1
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in performance monitoring: {e}")
+                    time.sleep(10)  # Longer sleep on error
+                    loop_count += 1
+        finally:
+            if self._manual_gc_active:
+                self._manual_gc_active = False
+                gc.enable()
         
         # Log if we hit the loop limit
         if loop_count >= max_loops:
@@ -142,16 +189,22 @@ class PerformanceMonitor:
     
     def _collect_metrics(self) -> PerformanceMetrics:
         """Collect current performance metrics"""
+        now = time.monotonic()
+        if self._last_sample is not None and now - self._last_sample_time < self._sample_ttl_seconds:
+            return self._last_sample
+        
         try:
-            # Memory usage
-            memory_info = self.process.memory_info()
-            memory_mb = memory_info.rss / (1024 * 1024)
-            
-            # CPU usage
-            cpu_percent = self.process.cpu_percent()
-            
-            # Thread count
-            thread_count = self.process.num_threads()
+            # Read the process counters together so psutil parses /proc once per sample
+            with self.process.oneshot():
+                # Memory usage
+                memory_info = self.process.memory_info()
+                memory_mb = memory_info.rss / (1024 * 1024)
+                
+                # CPU usage
+                cpu_percent = self.process.cpu_percent()
+                
+                # Thread count
+                thread_count = self.process.num_threads()
             
             # GC stats
             gc_stats = gc.get_stats()
@@ -160,12 +213,13 @@ class PerformanceMonitor:
             # Average response time
             avg_response_time = 0.0
             if self.response_times:
-                avg_response_time = sum(self.response_times[-10:]) / len(self.response_times[-10:])
+                recent_times = list(islice(reversed(self.response_times), 10))
+                avg_response_time = sum(recent_times) / len(recent_times)
             
             # Cache size
-            cache_size_mb = sys.getsizeof(self.operation_cache) / (1024 * 1024)
+            cache_size_mb = self._cache_bytes / (1024 * 1024)
             
-            return PerformanceMetrics(
+            metrics = PerformanceMetrics(
                 timestamp=datetime.now(),
                 memory_usage_mb=memory_mb,
                 cpu_usage_percent=cpu_percent,
@@ -174,6 +228,9 @@ class PerformanceMonitor:
                 gc_collections=total_collections,
                 cache_size_mb=cache_size_mb
             )
+            self._last_sample = metrics
+            self._last_sample_time = now
+            return metrics
             
         except Exception as e:
             self.logger.error(f"Error collecting metrics: {e}")
@@ -190,10 +247,6 @@ class PerformanceMonitor:
     def _add_metrics(self, metrics: PerformanceMetrics):
         """Add metrics to history"""
         self.metrics_history.append(metrics)
-        
-        # Trim history if too long
-        if len(self.metrics_history) > self.max_history_size:
-            self.metrics_history = self.metrics_history[-self.max_history_size//2:]
     
     def _check_optimization_triggers(self, metrics: PerformanceMetrics):
         """Check if optimization is needed based on current metrics"""
@@ -207,6 +260,10 @@ class PerformanceMonitor:
         elif memory_ratio > self.limits.memory_warning_threshold:
             self.logger.info(f"High memory usage: {metrics.memory_usage_mb:.1f}MB ({memory_ratio:.1%})")
             self._trigger_memory_optimization(urgent=False)
+            
+        elif self._manual_gc_active:
+            # Automatic collection is off, so sweep the young generation on each check
+            gc.collect(0)
         
         # Response time checks
         if metrics.response_time_ms > self.limits.max_response_time_ms:
@@ -247,6 +304,28 @@ class PerformanceMonitor:
             except Exception as e:
                 self.logger.error(f"Error in optimization callback: {e}")
     
+    def _tune_gc_thresholds(self):
+        """Raise the generation-0 collection threshold by the configured multiplier"""
+        multiplier = self.limits.gc_gen0_threshold_multiplier
+        if multiplier <= 1:
+            return
+        
+        gen0, gen1, gen2 = _BASE_GC_THRESHOLDS
+        if gen0 <= 0:
+            return  # Automatic collection is disabled; leave it that way
+        
+        if self._saved_gc_thresholds is None:
+            self._saved_gc_thresholds = gc.get_threshold()
+        gc.set_threshold(gen0 * multiplier, gen1, gen2)
+        self.logger.debug(f"GC generation-0 threshold set to {gen0 * multiplier}")
+    
+    def _restore_gc_thresholds(self):
+        """Put back the GC thresholds that were in effect before tuning"""
+        if self._saved_gc_thresholds is None:
+            return
+        gc.set_threshold(*self._saved_gc_thresholds)
+        self._saved_gc_thresholds = None
+    
     def _perform_garbage_collection(self):
         """Perform garbage collection and log results"""
         before_memory = self.process.memory_info().rss / (1024 * 1024)
@@ -262,25 +341,32 @@ class PerformanceMonitor:
     
     def _clean_cache(self):
         """Clean expired cache entries"""
-        current_time = datetime.now()
-        expired_keys = []
-        
-        for key, timestamp in self.cache_timestamps.items():
-            if current_time - timestamp > self.cache_max_age:
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            self.operation_cache.pop(key, None)
-            self.cache_timestamps.pop(key, None)
-        
-        if expired_keys:
-            self.logger.debug(f"Cleaned {len(expired_keys)} expired cache entries")
+        expire_before = time.monotonic() - self.cache_max_age
+        heap = self._cache_ttl_heap
+        expired_count = 0
+        
+        while heap and heap[0][0] < expire_before:
+            cached_at, key = heapq.heappop(heap)
+            entry = self.operation_cache.get(key)
+            if entry is not None and entry[1] == cached_at:
+                del self.operation_cache[key]
+                self._cache_bytes -= entry[3]
+                expired_count += 1
+        
+        if expired_count:
+            self.logger.debug(f"Cleaned {expired_count} expired cache entries")
+    
+    def _compact_cache_ttl_heap(self):
+        """Rebuild the TTL heap from live cache entries, dropping skipped items"""
+        self._cache_ttl_heap = [(entry[1], key) for key, entry in self.operation_cache.items()]
+        heapq.heapify(self._cache_ttl_heap)
     
     def _clear_cache(self):
         """Clear all cache entries"""
         cache_size = len(self.operation_cache)
         self.operation_cache.clear()
-        self.cache_timestamps.clear()
+        self._cache_ttl_heap.clear()
+        self._cache_bytes = 0
         
         if cache_size > 0:
             self.logger.info(f"Cleared {cache_size} cache entries")
@@ -301,11 +387,8 @@ class PerformanceMonitor:
         Args:
             response_time_ms: Response time in milliseconds
         """
+        # Only the most recent 100 response times are kept
         self.response_times.append(response_time_ms)
-        
-        # Keep only recent response times
-        if len(self.response_times) > 100:
-            self.response_times = self.response_times[-50:]
     
     def get_cached_result(self, operation_key: str) -> Optional[Any]:
         """
@@ -317,18 +400,21 @@ class PerformanceMonitor:
         Returns:
             Cached result or None if not found/expired
         """
-        if operation_key not in self.operation_cache:
+        entry = self.operation_cache.get(operation_key)
+        if entry is None:
             return None
         
         # Check if cache entry is still valid
-        timestamp = self.cache_timestamps.get(operation_key)
-        if timestamp and datetime.now() - timestamp > self.cache_max_age:
+        if time.monotonic() - entry[1] > self.cache_max_age:
             # Remove expired entry
-            self.operation_cache.pop(operation_key, None)
-            self.cache_timestamps.pop(operation_key, None)
+            del self.operation_cache[operation_key]
+            self._cache_bytes -= entry[3]
             return None
         
-        return self.operation_cache[operation_key]
+        # Count the hit and mark as most recently used
+        entry[2] += 1
+        self.operation_cache.move_to_end(operation_key)
+        return entry[0]
     
     def cache_result(self, operation_key: str, result: Any):
         """
@@ -338,22 +424,26 @@ class PerformanceMonitor:
             operation_key: Unique key for the operation
             result: Result to cache
         """
-        self.operation_cache[operation_key] = result
-        self.cache_timestamps[operation_key] = datetime.now()
-        
-        # Limit cache size
-        if len(self.operation_cache) > 1000:
-            # Remove oldest entries
-            sorted_items = sorted(
-                self.cache_timestamps.items(),
-                key=lambda x: x[1]
-            )
-            
-            # Remove oldest 20% of entries
-            remove_count = len(sorted_items) // 5
-            for key, _ in sorted_items[:remove_count]:
-                self.operation_cache.pop(key, None)
-                self.cache_timestamps.pop(key, None)
+        cached_at = time.monotonic()
+        size = sys.getsizeof(result)
+        previous = self.operation_cache.get(operation_key)
+        if previous is not None:
+            self._cache_bytes -= previous[3]
+        self.operation_cache[operation_key] = [result, cached_at, 0, size]
+        self._cache_bytes += size
+        heapq.heappush(self._cache_ttl_heap, (cached_at, operation_key))
+        # Evicted and re-cached keys leave items behind; rebuild once they dominate the heap
+        if len(self._cache_ttl_heap) > 2 * len(self.operation_cache) + 64:
+            self._compact_cache_ttl_heap()
+        self.operation_cache.move_to_end(operation_key)  # re-caching a key refreshes its position
+        
+        # Limit cache size: among the least recently used tenth of the entries,
+        # evict the one that has earned the fewest hits per byte it occupies
+        while len(self.operation_cache) > self.cache_max_entries:
+            window = islice(self.operation_cache.items(), max(1, len(self.operation_cache) // 10))
+            victim_key, victim = min(window, key=lambda item: (item[1][2] + 1) / item[1][3])
+            del self.operation_cache[victim_key]
+            self._cache_bytes -= victim[3]
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """
@@ -365,7 +455,7 @@ class PerformanceMonitor:
         if not self.metrics_history:
             return {"status": "no_data"}
         
-        recent_metrics = self.metrics_history[-10:]  # Last 10 measurements
+        recent_metrics = list(islice(reversed(self.metrics_history), 10))  # Last 10 measurements
         
         # Calculate averages
         avg_memory = sum(m.memory_usage_mb for m in recent_metrics) / len(recent_metrics)
@@ -426,8 +516,12 @@ class PerformanceMonitor:
                 "metrics": metrics_data
             }
             
-            with open(file_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(export_data, f, indent=2)
             
             self.logger.info(f"Performance metrics exported to {file_path}")
             return True
@@ -448,7 +542,7 @@ class PerformanceMonitor:
             gc.collect()
         
         # Reduce cache limits
-        self.cache_max_age = timedelta(minutes=5)  # Reduce cache age
+        self.cache_max_age = 300.0  # Reduce cache age to 5 minutes
         
         # Notify callbacks
         for callback in self.optimization_callbacks:
@@ -465,11 +559,14 @@ class PerformanceMonitor:
             Dictionary with memory usage by component
         """
         try:
-            memory_info = self.process.memory_info()
-            total_mb = memory_info.rss / (1024 * 1024)
+            # Reuse the last sample's RSS when it is recent enough
+            if self._last_sample is not None and time.monotonic() - self._last_sample_time < self._sample_ttl_seconds:
+                total_mb = self._last_sample.memory_usage_mb
+            else:
+                total_mb = self.process.memory_info().rss / (1024 * 1024)
             
             # Estimate component memory usage
-            cache_mb = sys.getsizeof(self.operation_cache) / (1024 * 1024)
+            cache_mb = self._cache_bytes / (1024 * 1024)
             metrics_mb = sys.getsizeof(self.metrics_history) / (1024 * 1024)
             
             return {
@@ -3,10 +3,17 @@ JSON-based persistence utilities for saving and loading application state.
 """
 import json
 import os
+import tempfile
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from models.data_models import Document, ChatMessage, GameState
 
 
@@ -19,7 +26,9 @@ class PersistenceManager:
         self.data_dir.mkdir(exist_ok=True)
         
         # Define file paths for different data types
-        self.documents_file = self.data_dir / "documents.json"
+        # Documents are stored one JSON object per line so saves stream a document at a time
+        self.documents_file = self.data_dir / "documents.ndjson"
+        self.legacy_documents_file = self.data_dir / "documents.json"
         self.chat_history_file = self.data_dir / "chat_history.json"
         self.game_states_file = self.data_dir / "game_states.json"
     
@@ -33,38 +42,83 @@ class PersistenceManager:
         """Convert ISO format string back to datetime object."""
         return datetime.fromisoformat(date_string)
     
+    def _write_json(self, file_path: Path, data: Any):
+        """Write data as indented UTF-8 JSON, using orjson when available."""
+        if ORJSON_AVAILABLE:
+            # Non-string keys are stringified the way json.dump does
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def _read_json(self, file_path: Path) -> Any:
+        """Read a JSON file, using orjson when available."""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(file_path.read_bytes())
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _dumps_line(self, data: Any) -> bytes:
+        """Encode data as a single newline-terminated UTF-8 JSON line."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8')
+    
+    def _loads_line(self, line: bytes) -> Any:
+        """Decode a single JSON line."""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(line)
+        return json.loads(line)
+    
     def save_documents(self, documents: List[Document]) -> bool:
-        """Save list of documents to JSON file."""
+        """Save list of documents to an NDJSON file, one document per line."""
         try:
-            documents_data = []
-            for doc in documents:
-                doc_dict = {
-                    "id": doc.id,
-                    "filename": doc.filename,
-                    "file_path": doc.file_path,
-                    "text_content": doc.text_content,
-                    "chunks": doc.chunks,
-                    "upload_date": doc.upload_date.isoformat(),
-                    "file_size": doc.file_size
-                }
-                documents_data.append(doc_dict)
+            # Write to a temporary file next to the target and swap it in afterwards, so an
+            # interrupted save leaves the previous file intact instead of a truncated one
+            fd, temp_path = tempfile.mkstemp(dir=self.data_dir, prefix=".documents.", suffix=".tmp")
+            try:
+                # Encode and write each document in turn so only one is serialized at a time
+                with os.fdopen(fd, 'wb') as f:
+                    for doc in documents:
+                        doc_dict = {
+                            "id": doc.id,
+                            "filename": doc.filename,
+                            "file_path": doc.file_path,
+                            "text_content": doc.text_content,
+                            "chunks": doc.chunks,
+                            "upload_date": doc.upload_date.isoformat(),
+                            "file_size": doc.file_size,
+                            "mtime": doc.mtime,
+                            "char_count": doc.char_count,
+                            "word_count": doc.word_count
+                        }
+                        f.write(self._dumps_line(doc_dict))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.documents_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
             
-            with open(self.documents_file, 'w', encoding='utf-8') as f:
-                json.dump(documents_data, f, indent=2, ensure_ascii=False)
+            # The array-format file is superseded once the NDJSON file is written
+            if self.legacy_documents_file.exists():
+                self.legacy_documents_file.unlink()
             return True
         except Exception as e:
             print(f"Error saving documents: {e}")
             return False
     
     def load_documents(self) -> List[Document]:
-        """Load documents from JSON file."""
+        """Load documents from the NDJSON file, or the older JSON array file."""
         try:
-            if not self.documents_file.exists():
+            if self.documents_file.exists():
+                documents_data = self._iter_documents_file()
+            elif self.legacy_documents_file.exists():
+                documents_data = self._read_json(self.legacy_documents_file)
+            else:
                 return []
             
-            with open(self.documents_file, 'r', encoding='utf-8') as f:
-                documents_data = json.load(f)
-            
             documents = []
             for doc_dict in documents_data:
                 doc = Document(
@@ -74,7 +128,10 @@ class PersistenceManager:
                     text_content=doc_dict["text_content"],
                     chunks=doc_dict["chunks"],
                     upload_date=self._deserialize_datetime(doc_dict["upload_date"]),
-                    file_size=doc_dict["file_size"]
+                    file_size=doc_dict["file_size"],
+                    mtime=doc_dict.get("mtime", 0.0),
+                    char_count=doc_dict.get("char_count", 0),
+                    word_count=doc_dict.get("word_count", 0)
                 )
                 documents.append(doc)
             return documents
@@ -82,6 +139,18 @@ class PersistenceManager:
             print(f"Error loading documents: {e}")
             return []
     
+    def _iter_documents_file(self):
+        """Yield document dicts from the NDJSON file one line at a time, skipping unreadable lines."""
+        with open(self.documents_file, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield self._loads_line(line)
+                except ValueError as e:
+                    # One damaged record (e.g. a cut-off last line) must not lose the others
+                    print(f"Skipping unreadable document on line {line_number}: {e}")
+    
     def save_chat_history(self, messages: List[ChatMessage]) -> bool:
         """Save chat history to JSON file."""
         try:
@@ -96,8 +165,7 @@ class PersistenceManager:
                 }
                 messages_data.append(msg_dict)
             
-            with open(self.chat_history_file, 'w', encoding='utf-8') as f:
-                json.dump(messages_data, f, indent=2, ensure_ascii=False)
+            self._write_json(self.chat_history_file, messages_data)
             return True
         except Exception as e:
             print(f"Error saving chat history: {e}")
@@ -109,8 +177,7 @@ class PersistenceManager:
             if not self.chat_history_file.exists():
                 return []
             
-            with open(self.chat_history_file, 'r', encoding='utf-8') as f:
-                messages_data = json.load(f)
+            messages_data = self._read_json(self.chat_history_file)
             
             messages = []
             for msg_dict in messages_data:
@@ -139,8 +206,7 @@ class PersistenceManager:
                 "ai_difficulty": game_state.ai_difficulty
             }
             
-            with open(self.game_states_file, 'w', encoding='utf-8') as f:
-                json.dump(game_data, f, indent=2, ensure_ascii=False)
+            self._write_json(self.game_states_file, game_data)
             return True
         except Exception as e:
             print(f"Error saving game state: {e}")
@@ -152,8 +218,7 @@ class PersistenceManager:
             if not self.game_states_file.exists():
                 return None
             
-            with open(self.game_states_file, 'r', encoding='utf-8') as f:
-                game_data = json.load(f)
+            game_data = self._read_json(self.game_states_file)
             
             game_state = GameState(
                 game_type=game_data["game_type"],
@@ -171,7 +236,8 @@ class PersistenceManager:
     def clear_all_data(self) -> bool:
         """Clear all persisted data files."""
         try:
-            for file_path in [self.documents_file, self.chat_history_file, self.game_states_file]:
+            for file_path in [self.documents_file, self.legacy_documents_file,
+                              self.chat_history_file, self.game_states_file]:
                 if file_path.exists():
                     file_path.unlink()
             return True
@@ -6,6 +6,7 @@ Main application entry point
 
 import sys
 import os
+import multiprocessing
 
 # Add the project root to Python path 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -24,4 +25,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
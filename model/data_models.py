@@ -3,20 +3,34 @@ Core data models for the Zeus Virtual Assistant application.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Dict
+import sys
 import uuid
 
+# Slotted dataclasses need Python 3.10+; earlier versions fall back to a per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Document:
     """Data model for uploaded documents."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     filename: str = ""
     file_path: str = ""
-    text_content: str = ""
+    text_content: Optional[str] = ""  # released (None) once the document is chunked
     chunks: List[str] = field(default_factory=list)
     upload_date: datetime = field(default_factory=datetime.now)
     file_size: int = 0
+    mtime: float = 0.0  # source file modification time when extracted
+    char_count: int = 0
+    word_count: int = 0
+    # Retrieval index: token -> indices of chunks containing it (rebuilt, not persisted)
+    inverted_index: Dict[str, List[int]] = field(default_factory=dict, repr=False, compare=False)
+    indexed_chunk_count: int = field(default=-1, repr=False, compare=False)
+    # Total UTF-8 size of the chunks for memory accounting, valid while measured_chunk_count == len(chunks)
+    chunk_utf8_bytes: int = field(default=0, repr=False, compare=False)
+    measured_chunk_count: int = field(default=-1, repr=False, compare=False)
+    filename_lower: str = field(default="", init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate document data after initialization."""
@@ -26,6 +40,14 @@ class Document:
             raise ValueError("Document file_path cannot be empty")
         if self.file_size < 0:
             raise ValueError("Document file_size cannot be negative")
+        
+        # Cache the lowercased name once so filename searches never re-lowercase it
+        self.filename_lower = self.filename.lower()
+        
+        # Backfill counts for documents created from full text (e.g. stored before counts existed)
+        if self.text_content and not self.char_count:
+            self.char_count = len(self.text_content)
+            self.word_count = len(self.text_content.split())
 
 
 @dataclass
@@ -36,6 +58,7 @@ class ChatMessage:
     content: str = ""
     timestamp: datetime = field(default_factory=datetime.now)
     context_type: str = "general"
+    byte_length: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate chat message data after initialization."""
@@ -45,6 +68,9 @@ class ChatMessage:
             raise ValueError("ChatMessage content cannot be empty")
         if self.context_type not in ["general", "document", "game"]:
             raise ValueError("ChatMessage context_type must be 'general', 'document', or 'game'")
+        
+        # Cache the UTF-8 size once so memory accounting never re-encodes content
+        self.byte_length = len(self.content.encode('utf-8'))
 
 
 @dataclass
@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration for the Z.E.U.S. Virtual Assistant tests.
+"""
+import os
+import sys
+
+# Make the project packages (core, games, ui, ...) importable without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
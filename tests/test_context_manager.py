@@ -0,0 +1,155 @@
+"""
+Tests for the deferred context writer in core.context_manager.
+"""
+import json
+import threading
+import time
+
+from core.context_manager import ContextManager
+from models.data_models import ChatMessage, Document, GameState
+
+
+def _wait_for(predicate, timeout=5.0):
+    """Poll predicate until it is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_writer_thread_starts_on_first_save_request(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    assert manager._save_thread is None
+    
+    manager.add_conversation_message(ChatMessage(sender="user", content="hello"))
+    assert manager._save_thread is not None and manager._save_thread.is_alive()
+    
+    assert manager.close()
+    assert not manager._save_thread.is_alive()
+
+
+def test_set_document_and_game_context_are_persisted(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    manager.save_delay_seconds = 0.01
+    document = Document(filename="notes.txt", file_path="/tmp/notes.txt", chunks=["first chunk", "second chunk"])
+    game = GameState(game_type="tic-tac-toe", board_state=[[None] * 3 for _ in range(3)])
+    
+    manager.set_document_context(document, document.chunks)
+    manager.set_game_context(game)
+    
+    def saved():
+        if not manager.context_file.exists():
+            return False
+        state = json.loads(manager.context_file.read_text(encoding="utf-8"))["conversation_state"]
+        return state["active_document"] == document.id and state["active_game"] == "tic-tac-toe"
+    
+    assert _wait_for(saved)
+    manager.close()
+    
+    reloaded = ContextManager(data_dir=str(tmp_path))
+    assert reloaded.conversation_state.document_context["chunks"] == ["first chunk", "second chunk"]
+    assert reloaded.conversation_state.game_context["game_type"] == "tic-tac-toe"
+    reloaded.close()
+
+
+def test_snapshot_is_isolated_from_later_mutation(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    game = GameState(game_type="tic-tac-toe", board_state=[[None] * 3 for _ in range(3)])
+    manager.set_game_context(game)
+    
+    _, state_data, items_data = manager._snapshot_state()
+    game.board_state[0][0] = "X"
+    
+    assert state_data["game_context"]["board_state"][0][0] is None
+    assert items_data["game_tic-tac-toe"]["data"]["board_state"][0][0] is None
+    manager.close()
+
+
+def test_older_snapshot_never_overwrites_newer_flush(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    manager.save_delay_seconds = 60  # keep the writer from picking the request up
+    manager.add_conversation_message(ChatMessage(sender="user", content="first"))
+    with manager._state_lock:
+        stale = (manager._save_generation, manager._snapshot_state())
+    
+    manager.add_conversation_message(ChatMessage(sender="zeus", content="second"))
+    assert manager.flush()
+    assert manager._write_snapshot(*stale)
+    
+    history = json.loads(manager.context_file.read_text(encoding="utf-8"))["conversation_state"]["conversation_history"]
+    assert [message["content"] for message in history] == ["first", "second"]
+    manager.close()
+
+
+def test_concurrent_mutation_while_writing_produces_valid_file(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    manager.save_delay_seconds = 0
+    game = GameState(game_type="connect4", board_state=[[None] * 7 for _ in range(6)])
+    manager.set_game_context(game)
+    errors = []
+    
+    def mutate():
+        try:
+            for i in range(300):
+                game.board_state[i % 6][i % 7] = i
+                manager.add_conversation_message(ChatMessage(sender="user", content=f"move {i}"))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+    
+    worker = threading.Thread(target=mutate)
+    worker.start()
+    worker.join()
+    
+    assert not errors
+    assert manager.close()
+    data = json.loads(manager.context_file.read_text(encoding="utf-8"))
+    assert data["conversation_state"]["conversation_history"][-1]["content"] == "move 299"
+
+
+def test_snapshot_is_taken_on_the_writer_thread(tmp_path, monkeypatch):
+    manager = ContextManager(data_dir=str(tmp_path))
+    manager.save_delay_seconds = 0
+    snapshot_threads = []
+    snapshot_state = manager._snapshot_state
+    
+    def recording_snapshot():
+        snapshot_threads.append(threading.current_thread())
+        return snapshot_state()
+    
+    monkeypatch.setattr(manager, "_snapshot_state", recording_snapshot)
+    manager.add_conversation_message(ChatMessage(sender="user", content="hello"))
+    
+    assert _wait_for(lambda: manager.context_file.exists())
+    assert snapshot_threads and threading.current_thread() not in snapshot_threads
+    manager.close()
+
+
+def test_snapshot_shares_chunk_lists_but_copies_game_state(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    document = Document(filename="notes.txt", file_path="/tmp/notes.txt", chunks=["first chunk"])
+    game = GameState(game_type="connect4", board_state=[[None] * 7 for _ in range(6)])
+    manager.set_document_context(document, document.chunks)
+    manager.set_game_context(game)
+    
+    _, state_data, items_data = manager._snapshot_state()
+    assert state_data["document_context"]["chunks"] is document.chunks
+    assert items_data[f"document_{document.id}"]["data"]["chunks"] is document.chunks
+    assert state_data["game_context"]["board_state"] is not game.board_state
+    # Shared between state and item in the live data, and still shared in the copy
+    assert state_data["game_context"] is items_data["game_connect4"]["data"]
+    manager.close()
+
+
+def test_reading_context_does_not_schedule_a_save(tmp_path):
+    manager = ContextManager(data_dir=str(tmp_path))
+    document = Document(filename="notes.txt", file_path="/tmp/notes.txt", chunks=["first chunk"])
+    manager.set_document_context(document, document.chunks)
+    generation = manager._save_generation
+    
+    context = manager.get_relevant_context("what does the document say?")
+    assert context["document_context"]["filename"] == "notes.txt"
+    assert manager._save_generation == generation
+    assert manager.context_items[f"document_{document.id}"].access_count == 1
+    manager.close()
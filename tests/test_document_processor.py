@@ -0,0 +1,196 @@
+"""
+Tests for streaming chunking and deferred document saves in core.document_processor.
+"""
+import random
+import threading
+import time
+
+import pytest
+
+from core import document_processor as document_processor_module
+from core.document_processor import DocumentProcessor
+from core.persistence import PersistenceManager
+from models.data_models import Document
+
+
+@pytest.fixture
+def persistence(tmp_path):
+    return PersistenceManager(data_dir=str(tmp_path))
+
+
+@pytest.fixture
+def processor(persistence):
+    processor = DocumentProcessor(persistence_manager=persistence)
+    yield processor
+    processor.close()
+
+
+def _sample_text(seed, words):
+    """Build text with sentence ends, blank lines, CRLF-free newlines and long unbroken runs."""
+    rng = random.Random(seed)
+    vocabulary = ["alpha", "beta.", "gamma!", "delta?", "naïve", "déjà", "\n", "\n\n", "  ", "x" * 120]
+    return "  " + " ".join(rng.choice(vocabulary) for _ in range(words)) + " \n"
+
+
+def _segments(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("seed,words", [(1, 0), (2, 5), (3, 400), (4, 5000)])
+@pytest.mark.parametrize("segment_size", [1, 7, 999, 1000, 1001, 10 ** 9])
+def test_streaming_chunker_matches_chunk_document(processor, seed, words, segment_size):
+    text = _sample_text(seed, words)
+    expected = processor.chunk_document(text.strip())
+    assert processor._chunk_stream(_segments(text, segment_size)) == expected
+
+
+# Chunk sizes stay above the 100-character boundary search window; smaller ones can
+# step backwards and never finish, in chunk_document as in the original chunker
+@pytest.mark.parametrize("chunk_size,overlap", [(200, 150), (300, 50), (1000, 0)])
+def test_streaming_chunker_matches_chunk_document_with_custom_sizes(processor, chunk_size, overlap):
+    text = _sample_text(5, 2000)
+    expected = processor.chunk_document(text.strip(), chunk_size, overlap)
+    assert processor._chunk_stream(_segments(text, 333), chunk_size, overlap) == expected
+
+
+def test_extract_chunks_matches_extract_text_then_chunk(processor, tmp_path):
+    path = tmp_path / "sample.txt"
+    path.write_bytes(_sample_text(6, 3000).replace("\n", "\r\n").encode("utf-8"))
+    processor.TXT_SEGMENT_BYTES = 4096
+    
+    text = processor.extract_text(str(path))
+    chunks, char_count, word_count = processor.extract_chunks(str(path))
+    
+    assert chunks == processor.chunk_document(text)
+    assert char_count == len(text)
+    assert word_count == len(text.split())
+
+
+def _document(name):
+    return Document(filename=name, file_path=f"/docs/{name}", text_content=f"text of {name}")
+
+
+def test_save_thread_starts_on_first_store_and_close_joins_it(processor, persistence):
+    assert processor._save_thread is None
+    
+    processor.save_delay_seconds = 60
+    assert processor._store_document(_document("a.txt"))
+    assert processor._save_thread.is_alive()
+    
+    # close() must not wait out the save delay, and must write the pending store itself
+    assert processor.close()
+    assert not processor._save_thread.is_alive()
+    assert [doc.filename for doc in persistence.load_documents()] == ["a.txt"]
+
+
+def test_background_writer_coalesces_stores(processor, persistence, monkeypatch):
+    writes = []
+    save_documents = persistence.save_documents
+    
+    def counting_save(documents):
+        writes.append(len(documents))
+        return save_documents(documents)
+    
+    monkeypatch.setattr(persistence, "save_documents", counting_save)
+    processor.save_delay_seconds = 0.2
+    for name in ("a.txt", "b.txt", "c.txt"):
+        processor._store_document(_document(name))
+    
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writes == [3]
+    assert processor.flush()
+    assert writes == [3]  # nothing left pending
+
+
+def test_flush_waits_for_a_write_already_in_progress(processor, persistence, monkeypatch):
+    write_started = threading.Event()
+    save_documents = persistence.save_documents
+    
+    def slow_save(documents):
+        write_started.set()
+        time.sleep(0.3)
+        return save_documents(documents)
+    
+    monkeypatch.setattr(persistence, "save_documents", slow_save)
+    processor.save_delay_seconds = 0
+    processor._store_document(_document("a.txt"))
+    assert write_started.wait(5)
+    
+    assert processor.flush()
+    assert [doc.filename for doc in PersistenceManager(str(persistence.data_dir)).load_documents()] == ["a.txt"]
+
+
+def test_flush_reports_failed_save_until_a_later_one_succeeds(processor, persistence, monkeypatch):
+    processor.save_delay_seconds = 60
+    processor._store_document(_document("a.txt"))
+    
+    monkeypatch.setattr(persistence, "save_documents", lambda documents: False)
+    assert not processor.flush()
+    
+    monkeypatch.undo()
+    assert processor.flush()
+    assert [doc.filename for doc in persistence.load_documents()] == ["a.txt"]
+
+
+def test_remove_document_is_written_immediately(processor, persistence):
+    processor.save_delay_seconds = 60
+    keep, drop = _document("keep.txt"), _document("drop.txt")
+    processor._store_document(keep)
+    processor._store_document(drop)
+    
+    assert processor.remove_document(drop.id)
+    assert [doc.filename for doc in persistence.load_documents()] == ["keep.txt"]
+
+
+def test_exit_hook_writes_a_save_that_is_still_deferred(processor, persistence):
+    processor.save_delay_seconds = 60
+    processor._store_document(_document("late.txt"))
+    assert processor in document_processor_module._processors_with_writer
+    
+    document_processor_module._close_processors_at_exit()
+    assert not processor._save_thread.is_alive()
+    assert processor not in document_processor_module._processors_with_writer
+    assert [doc.filename for doc in persistence.load_documents()] == ["late.txt"]
+
+
+class _RecordingProgress:
+    """Progress indicator stand-in that runs work on a thread and records what ran there."""
+    
+    def __init__(self):
+        self.ran = []
+    
+    def show(self, message, indeterminate=True):
+        pass
+    
+    def update_message(self, message):
+        pass
+    
+    def hide(self):
+        pass
+    
+    def run(self, func, *args):
+        results = []
+        worker = threading.Thread(target=lambda: results.append(func(*args)))
+        worker.start()
+        worker.join()
+        self.ran.append((getattr(func, "__name__", func), worker.ident))
+        return results[0]
+
+
+def test_upload_runs_file_work_behind_the_progress_indicator(processor, tmp_path, monkeypatch):
+    path = tmp_path / "upload.txt"
+    path.write_text(_sample_text(7, 500), encoding="utf-8")
+    progress = _RecordingProgress()
+    processor.error_handler = type("Handler", (), {"create_progress_indicator": lambda self, title: progress})()
+    monkeypatch.setattr(document_processor_module.filedialog, "askopenfilename", lambda **kwargs: str(path))
+    processor.save_delay_seconds = 60
+    
+    document = processor.upload_document()
+    
+    names = [name for name, _ in progress.ran]
+    assert names[:2] == ["_validate_file", "_build_document"]
+    assert threading.get_ident() not in [ident for _, ident in progress.ran]
+    assert document.chunks == processor.chunk_document(processor.extract_text(str(path)))
+    assert processor.find_document_by_path(str(path)) is document
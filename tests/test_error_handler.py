@@ -0,0 +1,115 @@
+"""
+Tests for the queued log pipeline and error coalescing in core.error_handler.
+"""
+import logging
+import time
+
+import pytest
+
+from core import error_handler as error_handler_module
+from core.error_handler import ErrorCategory, ErrorHandler
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def captured():
+    """Collect records that reach the 'core' logger, as the app's handlers would."""
+    parent = logging.getLogger("core")
+    handler = _ListHandler()
+    old_level = parent.level
+    parent.addHandler(handler)
+    parent.setLevel(logging.INFO)
+    yield handler
+    parent.removeHandler(handler)
+    parent.setLevel(old_level)
+
+
+def test_exit_hook_writes_out_queued_records(captured):
+    handler = ErrorHandler()
+    logger = logging.getLogger("core.error_handler")
+    assert logger.propagate is False
+    
+    for i in range(500):
+        logger.info(f"record {i}")
+    error_handler_module._stop_log_pipeline_at_exit()
+    
+    assert captured.messages[-500:] == [f"record {i}" for i in range(500)]
+    assert logger.propagate is True
+    assert error_handler_module._log_listener is None
+    
+    # Handlers still alive at exit can stop afterwards without disturbing a new pipeline
+    other = ErrorHandler()
+    handler.shutdown()
+    assert error_handler_module._log_pipeline_refs == 1
+    other.shutdown()
+    assert error_handler_module._log_pipeline_refs == 0
+    assert logger.propagate is True
+
+
+@pytest.fixture
+def handler():
+    handler = ErrorHandler()
+    yield handler
+    handler.shutdown()
+
+
+def test_repeats_are_coalesced_into_one_report(handler, captured):
+    handler.coalesce_window_seconds = 60
+    first = handler.handle_error(ValueError("boom"), ErrorCategory.DOCUMENT, show_dialog=False)
+    for _ in range(3):
+        assert handler.handle_error(ValueError("boom"), ErrorCategory.DOCUMENT, show_dialog=False) is first
+    
+    handler._flush_coalesced()
+    assert len(handler.get_error_history()) == 2
+    assert "(repeated 3 more times" in handler.get_error_history()[-1].message
+
+
+def test_different_message_or_context_is_reported_separately(handler):
+    handler.coalesce_window_seconds = 60
+    error = ValueError("boom")
+    first = handler.handle_error(error, ErrorCategory.DOCUMENT, custom_message="one", show_dialog=False)
+    second = handler.handle_error(error, ErrorCategory.DOCUMENT, custom_message="two", show_dialog=False)
+    third = handler.handle_error(error, ErrorCategory.DOCUMENT, custom_message="two",
+                                 context={"file_path": "b.txt"}, show_dialog=False)
+    
+    assert [first.message, second.message] == ["one", "two"]
+    assert third is not second and third.context == {"file_path": "b.txt"}
+
+
+def test_dialog_requests_are_never_coalesced(handler, monkeypatch):
+    handler.coalesce_window_seconds = 60
+    shown = []
+    handler.parent_widget = object()
+    monkeypatch.setattr(handler, "_show_error_dialog", shown.append)
+    
+    handler.handle_error(ValueError("boom"), ErrorCategory.DOCUMENT, show_dialog=False)
+    handler.handle_error(ValueError("boom"), ErrorCategory.DOCUMENT)
+    handler.handle_error(ValueError("boom"), ErrorCategory.DOCUMENT)
+    assert len(shown) == 2
+
+
+def test_each_window_closes_from_its_own_first_occurrence(handler):
+    handler.coalesce_window_seconds = 0.5
+    handler.handle_error(ValueError("early"), ErrorCategory.DOCUMENT, show_dialog=False)
+    time.sleep(0.3)
+    handler.handle_error(ValueError("late"), ErrorCategory.DOCUMENT, show_dialog=False)
+    
+    def open_windows():
+        with handler._recent_lock:
+            return [entry[1].technical_details for entry in handler._recent_errors.values()]
+    
+    time.sleep(0.35)  # past the early window, 0.35s into the late one
+    assert open_windows() == ["late"]
+    
+    deadline = time.monotonic() + 5
+    while open_windows() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert open_windows() == []
@@ -0,0 +1,54 @@
+"""
+Tests for pressure-driven memory pool sizing in core.memory_optimizer.
+"""
+import pytest
+
+from core.memory_optimizer import MemoryOptimizer
+
+
+@pytest.fixture
+def optimizer(monkeypatch):
+    optimizer = MemoryOptimizer(max_memory_mb=1000)
+    usage = {"mb": 100.0}
+    monkeypatch.setattr(optimizer, "get_pressure_memory_usage", lambda: usage["mb"])
+    monkeypatch.setattr(optimizer, "get_current_memory_usage", lambda fresh=False: usage["mb"])
+    optimizer.usage = usage
+    return optimizer
+
+
+def _pool_sizes(optimizer):
+    return {name: pool.max_size for name, pool in optimizer.memory_pools.items()}
+
+
+def test_pressure_check_resizes_pools_at_a_bounded_cadence(optimizer):
+    base = _pool_sizes(optimizer)
+    optimizer.check_memory_pressure()  # 10% usage: grow
+    assert _pool_sizes(optimizer) == {name: size * 2 for name, size in base.items()}
+    
+    optimizer.check_memory_pressure()  # within the interval: unchanged
+    assert _pool_sizes(optimizer) == {name: size * 2 for name, size in base.items()}
+    
+    optimizer.usage["mb"] = 900.0
+    optimizer._pool_resize_time = float('-inf')
+    assert optimizer.check_memory_pressure()
+    assert _pool_sizes(optimizer) == base
+
+
+def test_pool_growth_is_capped(optimizer):
+    base = _pool_sizes(optimizer)
+    optimizer.pool_resize_interval_seconds = 0
+    for _ in range(10):
+        optimizer.check_memory_pressure()
+    assert _pool_sizes(optimizer) == {name: size * optimizer.pool_max_scale for name, size in base.items()}
+
+
+def test_comprehensive_optimization_never_grows_pools(optimizer):
+    base = _pool_sizes(optimizer)
+    results = optimizer.perform_comprehensive_optimization()
+    assert "resized_memory_pools" not in results["optimizations_performed"]
+    assert _pool_sizes(optimizer) == base
+    
+    optimizer.usage["mb"] = 900.0
+    results = optimizer.perform_comprehensive_optimization()
+    assert "resized_memory_pools" in results["optimizations_performed"]
+    assert _pool_sizes(optimizer) == {name: size // 2 for name, size in base.items()}
@@ -0,0 +1,144 @@
+"""
+Tests for the operation cache and GC threshold handling in core.performance_monitor.
+"""
+import gc
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from core import performance_monitor as performance_monitor_module
+from core.performance_monitor import PerformanceMonitor
+
+
+class _Clock:
+    """Controllable stand-in for time.monotonic()."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(performance_monitor_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def monitor(clock):
+    return PerformanceMonitor()
+
+
+def _assert_byte_counter(monitor):
+    entries = monitor.operation_cache.values()
+    assert monitor._cache_bytes == sum(sys.getsizeof(entry[0]) for entry in entries)
+
+
+def test_least_recently_used_entry_is_evicted(monitor):
+    monitor.cache_max_entries = 5
+    for i in range(5):
+        monitor.cache_result(f"k{i}", f"value {i}")
+    assert monitor.get_cached_result("k0") == "value 0"
+    
+    monitor.cache_result("k5", "value 5")
+    assert list(monitor.operation_cache) == ["k2", "k3", "k4", "k0", "k5"]
+    _assert_byte_counter(monitor)
+
+
+def test_hits_protect_entries_within_the_eviction_window(monitor):
+    monitor.cache_max_entries = 20  # eviction window is the oldest two entries
+    for i in range(20):
+        monitor.cache_result(f"k{i}", f"value {i}")
+    monitor.get_cached_result("k0")
+    monitor.cache_result("k1", "value 1")  # re-caching resets its hits
+    for i in range(2, 20):
+        monitor.get_cached_result(f"k{i}")
+    assert list(monitor.operation_cache)[:2] == ["k0", "k1"]
+    
+    monitor.cache_result("k20", "value 20")
+    assert "k0" in monitor.operation_cache
+    assert "k1" not in monitor.operation_cache
+    _assert_byte_counter(monitor)
+
+
+def test_larger_entry_is_evicted_first_when_hits_are_equal(monitor):
+    monitor.cache_max_entries = 20
+    monitor.cache_result("big", "x" * 10000)
+    for i in range(18):
+        monitor.cache_result(f"k{i}", f"value {i}")
+    monitor.cache_result("small", "s")  # full; the oldest two are "big" and "k0"
+    
+    monitor.cache_result("k19", "value 19")
+    assert "big" not in monitor.operation_cache
+    assert "k0" in monitor.operation_cache
+    _assert_byte_counter(monitor)
+
+
+def test_expired_entries_are_cleaned_from_the_heap(monitor, clock):
+    monitor.cache_result("old", "old value")
+    clock.now += 300
+    monitor.cache_result("new", "new value")
+    
+    clock.now += monitor.cache_max_age - 100
+    monitor._clean_cache()
+    assert list(monitor.operation_cache) == ["new"]
+    assert monitor._cache_ttl_heap == [(clock.now - monitor.cache_max_age + 100, "new")]
+    _assert_byte_counter(monitor)
+
+
+def test_get_cached_result_expires_lazily(monitor, clock):
+    monitor.cache_result("key", "value")
+    clock.now += monitor.cache_max_age + 1
+    
+    assert monitor.get_cached_result("key") is None
+    assert "key" not in monitor.operation_cache
+    assert monitor._cache_bytes == 0
+
+
+def test_stale_heap_item_does_not_expire_a_recached_key(monitor, clock):
+    monitor.cache_result("key", "first")
+    clock.now += monitor.cache_max_age - 1
+    monitor.cache_result("key", "second value")
+    
+    clock.now += 2  # the first heap item is now past the age limit
+    monitor._clean_cache()
+    assert monitor.get_cached_result("key") == "second value"
+    _assert_byte_counter(monitor)
+
+
+def test_ttl_heap_stays_bounded_when_keys_are_recached(monitor, clock):
+    for i in range(1000):
+        clock.now += 0.001
+        monitor.cache_result("key", i)
+    
+    assert len(monitor._cache_ttl_heap) <= 2 * len(monitor.operation_cache) + 64
+    assert monitor.get_cached_result("key") == 999
+    _assert_byte_counter(monitor)
+
+
+def test_byte_counter_tracks_overwrite_and_clear(monitor):
+    monitor.cache_result("key", "short")
+    monitor.cache_result("key", "a much longer value" * 10)
+    monitor.cache_result("other", [1, 2, 3])
+    _assert_byte_counter(monitor)
+    
+    monitor._clear_cache()
+    assert monitor._cache_bytes == 0
+    assert monitor._cache_ttl_heap == []
+
+
+def test_gc_thresholds_are_tuned_only_while_monitoring():
+    original = gc.get_threshold()
+    monitor = PerformanceMonitor()
+    assert gc.get_threshold() == original
+    
+    try:
+        monitor.start_monitoring()
+        assert gc.get_threshold()[0] == performance_monitor_module._BASE_GC_THRESHOLDS[0] * 10
+    finally:
+        monitor.stop_monitoring()
+    assert gc.get_threshold() == original
@@ -0,0 +1,127 @@
+"""
+Tests for JSON/NDJSON persistence in core.persistence.
+"""
+import json
+
+import pytest
+
+from core import persistence as persistence_module
+from core.persistence import PersistenceManager
+from models.data_models import ChatMessage, Document, GameState
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def manager(request, tmp_path, monkeypatch):
+    if request.param and not persistence_module.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(persistence_module, "ORJSON_AVAILABLE", request.param)
+    return PersistenceManager(data_dir=str(tmp_path))
+
+
+def _documents():
+    return [
+        Document(filename="a.txt", file_path="/docs/a.txt", text_content=None,
+                 chunks=["line one\nline two", "naïve café"], file_size=10, mtime=1.5),
+        Document(filename="b.txt", file_path="/docs/b.txt", text_content="short text"),
+    ]
+
+
+def test_documents_round_trip_one_line_per_document(manager):
+    documents = _documents()
+    assert manager.save_documents(documents)
+    
+    lines = manager.documents_file.read_bytes().splitlines()
+    assert len(lines) == 2
+    assert [json.loads(line)["filename"] for line in lines] == ["a.txt", "b.txt"]
+    
+    loaded = manager.load_documents()
+    assert [(doc.id, doc.filename, doc.chunks, doc.text_content, doc.mtime) for doc in loaded] == \
+        [(doc.id, doc.filename, doc.chunks, doc.text_content, doc.mtime) for doc in documents]
+    assert loaded[0].upload_date == documents[0].upload_date
+
+
+def test_in_memory_index_fields_are_not_persisted(manager):
+    document = _documents()[0]
+    document.inverted_index = {"line": [0]}
+    document.indexed_chunk_count = 2
+    manager.save_documents([document])
+    
+    record = json.loads(manager.documents_file.read_bytes().splitlines()[0])
+    assert "inverted_index" not in record
+    assert manager.load_documents()[0].inverted_index == {}
+
+
+def test_legacy_json_array_is_loaded_then_replaced(manager):
+    legacy = [{
+        "id": "legacy-1",
+        "filename": "old.txt",
+        "file_path": "/docs/old.txt",
+        "text_content": "old text",
+        "chunks": ["old text"],
+        "upload_date": "2024-01-01T00:00:00",
+        "file_size": 8
+    }]
+    manager.legacy_documents_file.write_text(json.dumps(legacy), encoding="utf-8")
+    
+    loaded = manager.load_documents()
+    assert [doc.id for doc in loaded] == ["legacy-1"]
+    assert loaded[0].mtime == 0.0  # fields added later fall back to defaults
+    
+    assert manager.save_documents(loaded)
+    assert not manager.legacy_documents_file.exists()
+    assert [doc.id for doc in manager.load_documents()] == ["legacy-1"]
+
+
+def test_ndjson_file_takes_precedence_over_legacy_file(manager):
+    manager.save_documents(_documents()[:1])
+    manager.legacy_documents_file.write_text("[]", encoding="utf-8")
+    
+    assert [doc.filename for doc in manager.load_documents()] == ["a.txt"]
+
+
+def test_clear_all_data_removes_legacy_documents_file(manager):
+    manager.save_documents(_documents())
+    manager.legacy_documents_file.write_text("[]", encoding="utf-8")
+    
+    assert manager.clear_all_data()
+    assert manager.load_documents() == []
+    assert not manager.legacy_documents_file.exists()
+
+
+def test_chat_history_and_game_state_round_trip(manager):
+    messages = [ChatMessage(sender="user", content="héllo ⚡"), ChatMessage(sender="zeus", content="hi")]
+    assert manager.save_chat_history(messages)
+    assert [(msg.id, msg.content) for msg in manager.load_chat_history()] == \
+        [(msg.id, msg.content) for msg in messages]
+    assert "héllo ⚡" in manager.chat_history_file.read_text(encoding="utf-8")
+    
+    game = GameState(game_type="connect4", board_state=[[1, None]], move_history=[(0, 1), {1: "x"}])
+    assert manager.save_game_state(game)
+    loaded = manager.load_game_state()
+    assert loaded.board_state == [[1, None]]
+    assert loaded.move_history == [[0, 1], {"1": "x"}]  # same shape json.dump produces
+
+
+def test_truncated_last_line_keeps_the_other_documents(manager):
+    documents = _documents() + [Document(filename="c.txt", file_path="/docs/c.txt", text_content="third")]
+    manager.save_documents(documents)
+    data = manager.documents_file.read_bytes()
+    manager.documents_file.write_bytes(data[:-40])
+    
+    assert [doc.filename for doc in manager.load_documents()] == ["a.txt", "b.txt"]
+
+
+def test_failed_save_leaves_previous_file_and_no_temp_file(manager, monkeypatch):
+    manager.save_documents(_documents())
+    before = manager.documents_file.read_bytes()
+    manager.legacy_documents_file.write_text("[]", encoding="utf-8")
+    
+    def failing_dumps(data):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(manager, "_dumps_line", failing_dumps)
+    assert not manager.save_documents(_documents())
+    
+    assert manager.documents_file.read_bytes() == before
+    assert manager.legacy_documents_file.exists()
+    assert sorted(path.name for path in manager.data_dir.iterdir()) == ["documents.json", "documents.ndjson"]
@@ -11,7 +11,6 @@ This module provides the document analysis interface including:
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from typing import Optional, Callable, List
-import threading
 from datetime import datetime
 
 from core.document_processor import DocumentProcessor
@@ -300,8 +299,8 @@ class DocumentViewer:
         details = [
             ("Filename:", document.filename),
             ("File Size:", f"{document.file_size // 1024} KB"),
-            ("Word Count:", f"{len(document.text_content.split()):,}"),
-            ("Character Count:", f"{len(document.text_content):,}"),
+            ("Word Count:", f"{document.word_count:,}"),
+            ("Character Count:", f"{document.char_count:,}"),
             ("Chunks:", f"{len(document.chunks)}"),
             ("Upload Date:", document.upload_date.strftime("%Y-%m-%d %H:%M:%S"))
         ]
@@ -334,10 +333,11 @@ class DocumentViewer:
             "header"
         )
         
-        # Show content preview (first 2000 characters)
-        content_preview = document.text_content[:2000]
-        if len(document.text_content) > 2000:
-            content_preview += "\n\n[Content truncated - showing first 2000 characters]"
+        # Show content preview (first 2000 characters, or the first chunk once the full text is released)
+        preview_source = document.text_content or (document.chunks[0] if document.chunks else "")
+        content_preview = preview_source[:2000]
+        if document.char_count > len(content_preview):
+            content_preview += f"\n\n[Content truncated - showing first {len(content_preview):,} characters]"
         
         self.document_content_display.insert(tk.END, content_preview, "content")
         
@@ -359,20 +359,15 @@ class DocumentViewer:
         
         self._start_processing("Uploading document...")
         
-        def upload_in_background():
-            try:
-                document = self.document_processor.upload_document()
-                
-                # Update UI in main thread
-                self.parent.after(0, lambda: self._handle_upload_result(document))
-                
-            except Exception as e:
-                error_msg = f"Upload failed: {str(e)}"
-                self.parent.after(0, lambda: self._handle_upload_error(error_msg))
+        # The file dialog and progress window must be created on this (the Tk) thread;
+        # upload_document runs the extraction on a worker behind its progress window
+        try:
+            document = self.document_processor.upload_document()
+        except Exception as e:
+            self._handle_upload_error(f"Upload failed: {str(e)}")
+            return
         
-        # Start upload in background thread
-        thread = threading.Thread(target=upload_in_background, daemon=True)
-        thread.start()
+        self._handle_upload_result(document)
     
     def _handle_upload_result(self, document: Optional[Document]):
         """Handle upload result in main thread"""
@@ -88,6 +88,9 @@ class ZeusMainWindow:
         
         # Configure window for better appearance
         self.root.configure(bg=self.style_manager.get_color('background'))
+        
+        # Route the window close button through destroy() so pending saves are written
+        self.root.protocol("WM_DELETE_WINDOW", self.destroy)
     
     def create_widgets(self):
         """Create the main window layout"""
@@ -594,9 +597,9 @@ No internet connection required.
     
     def destroy(self):
         """Clean up and destroy the window"""
-        # Save context before closing
+        # Save context and stop its save thread before closing
         if hasattr(self, 'context_manager'):
-            self.context_manager.save_context()
+            self.context_manager.close()
         
         self.root.destroy()
     
@@ -793,6 +796,9 @@ No internet connection required.
     def _check_performance_status(self):
         """Check current performance status and update UI"""
         try:
+            # Measure memory pressure, which also fits the optimizer's pool sizes to it
+            self.memory_optimizer.check_memory_pressure()
+            
             # Get performance summary
             perf_summary = self.performance_monitor.get_performance_summary()
             
@@ -917,7 +923,7 @@ No internet connection required.
                 stats_text.insert(tk.END, f"{category.upper()}:\n")
                 if isinstance(data, dict):
                     for key, value in data.items():
-                        stats_text.insert(tk.END, f"  {key}: {value}\n")
+                        stats_text.insert(tk.END, f"  {key}: {self._format_stat_value(value)}\n")
                 else:
                     stats_text.insert(tk.END, f"  {data}\n")
                 stats_text.insert(tk.END, "\n")
@@ -958,6 +964,13 @@ No internet connection required.
                 custom_message="Failed to show performance statistics."
             )
     
+    @staticmethod
+    def _format_stat_value(value) -> str:
+        """Format a statistics value for display, rounding raw floats to two decimals"""
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+    
     def _refresh_performance_dialog(self, text_widget):
         """Refresh performance dialog content"""
         try:
@@ -974,7 +987,7 @@ No internet connection required.
                 text_widget.insert(tk.END, f"{category.upper()}:\n")
                 if isinstance(data, dict):
                     for key, value in data.items():
-                        text_widget.insert(tk.END, f"  {key}: {value}\n")
+                        text_widget.insert(tk.END, f"  {key}: {self._format_stat_value(value)}\n")
                 else:
                     text_widget.insert(tk.END, f"  {data}\n")
                 text_widget.insert(tk.END, "\n")
@@ -987,9 +1000,13 @@ No internet connection required.
     def destroy(self):
         """Clean up and destroy the window"""
         try:
-            # Save context before closing
+            # Save context and stop its save thread before closing
             if hasattr(self, 'context_manager'):
-                self.context_manager.save_context()
+                self.context_manager.close()
+            
+            # Write pending document changes and stop the document save thread
+            if hasattr(self, 'document_processor'):
+                self.document_processor.close()
             
             # Stop performance monitoring
             if hasattr(self, 'performance_monitor'):
@@ -999,6 +1016,9 @@ No internet connection required.
             if hasattr(self, 'background_processor'):
                 self.background_processor.stop()
             
+            # Write out queued error log records
+            self.error_handler.shutdown()
+            
             self.root.destroy()
             
         except Exception as e:
@@ -61,6 +61,7 @@ a = Analysis(
         'tkinter.ttk',
         'tkinter.filedialog',
         'tkinter.messagebox',
+        'fitz',
         'PyPDF2',
         'docx',
         'numpy',